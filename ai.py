@@ -12,9 +12,27 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import Dataset, DataLoader
+from contextlib import contextmanager
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+from backend.indicators import technical_indicators
+
+# Report stage timings to the backend's metrics registry when it is available
+try:
+    from backend.metrics import span, count_upstream, record_training
+except ImportError:
+    @contextmanager
+    def span(stage):
+        yield
+
+    def count_upstream(call):
+        pass
+
+    def record_training(model, epochs, seconds):
+        pass
+
 
 class StockDataset(Dataset):
     """
@@ -110,12 +128,13 @@ class StockPredictor:
         
         print(f"Using device: {self.device}")
     
+    @span("predictor.fetch")
     def fetch_data(self, period: str = "2y", interval: str = "1d") -> pd.DataFrame:
         """
         Fetch stock data using yfinance
         """
         try:
-            stock = yf.Ticker(self.ticker)
+            count_upstream("download")
             df = yf.download(self.ticker, period=period, interval=interval, progress=False)
             
             if df.empty:
@@ -133,63 +152,15 @@ class StockPredictor:
         except Exception as e:
             raise Exception(f"Error fetching data for {self.ticker}: {str(e)}")
     
+    @span("predictor.indicators")
     def calculate_technical_indicators(self) -> pd.DataFrame:
         """
         Calculate technical indicators
         """
         df = self.data.copy()
-        
-        # Moving Averages
-        df['SMA_5'] = df['Close'].rolling(window=5).mean()
-        df['SMA_10'] = df['Close'].rolling(window=10).mean()
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        
-        # Exponential Moving Averages
-        df['EMA_12'] = df['Close'].ewm(span=12, adjust=False).mean()
-        df['EMA_26'] = df['Close'].ewm(span=26, adjust=False).mean()
-        
-        # MACD
-        df['MACD'] = df['EMA_12'] - df['EMA_26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-        
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        bb_std = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-        df['BB_Width'] = df['BB_Upper'] - df['BB_Lower']
-        
-        # Momentum
-        df['Momentum'] = df['Close'] - df['Close'].shift(10)
-        
-        # Rate of Change
-        df['ROC'] = ((df['Close'] - df['Close'].shift(10)) / df['Close'].shift(10)) * 100
-        
-        # Volume indicators
-        df['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
-        df['Volume_Ratio'] = df['Volume'] / df['Volume_SMA']
-        
-        # Price change percentage
-        df['Price_Change'] = df['Close'].pct_change()
-        
-        # Volatility
-        df['Volatility'] = df['Price_Change'].rolling(window=20).std()
-        
-        # Support/Resistance levels
-        df['High_20'] = df['High'].rolling(window=20).max()
-        df['Low_20'] = df['Low'].rolling(window=20).min()
-        
-        # Distance from highs/lows
-        df['Distance_from_High'] = (df['High_20'] - df['Close']) / df['Close']
-        df['Distance_from_Low'] = (df['Close'] - df['Low_20']) / df['Close']
+        indicators = technical_indicators(df['Close'], df['High'], df['Low'], df['Volume'])
+        for name, values in indicators.items():
+            df[name] = values
         
         return df
     
@@ -248,6 +219,7 @@ class StockPredictor:
         
         return np.array(X_seq), np.array(y_seq)
     
+    @span("predictor.train_feedforward")
     def train_feedforward_model(self, X_train, y_train, X_test, y_test, epochs=100, batch_size=32):
         """
         Train feedforward neural network
@@ -269,9 +241,12 @@ class StockPredictor:
         
         best_loss = float('inf')
         patience_counter = 0
+        train_start = time.perf_counter()
+        epochs_run = 0
         
         # Training loop
         for epoch in range(epochs):
+            epochs_run += 1
             model.train()
             train_loss = 0.0
             
@@ -314,9 +289,11 @@ class StockPredictor:
                     print(f"Early stopping at epoch {epoch+1}")
                     break
         
+        record_training('feedforward', epochs_run, time.perf_counter() - train_start)
         self.models['feedforward'] = model
         return model
     
+    @span("predictor.train_lstm")
     def train_lstm_model(self, X_train, y_train, X_test, y_test, seq_length=10, epochs=100, batch_size=32):
         """
         Train LSTM neural network
@@ -342,9 +319,12 @@ class StockPredictor:
         
         best_loss = float('inf')
         patience_counter = 0
+        train_start = time.perf_counter()
+        epochs_run = 0
         
         # Training loop
         for epoch in range(epochs):
+            epochs_run += 1
             model.train()
             train_loss = 0.0
             
@@ -387,6 +367,7 @@ class StockPredictor:
                     print(f"Early stopping at epoch {epoch+1}")
                     break
         
+        record_training('lstm', epochs_run, time.perf_counter() - train_start)
         self.models['lstm'] = model
         return model
     
@@ -413,6 +394,7 @@ class StockPredictor:
         print("\n" + "="*50)
         print("All models trained successfully!")
     
+    @span("predictor.predict")
     def predict_next_price(self, method='ensemble') -> dict:
         """
         Predict next day's price using trained models
@@ -0,0 +1,84 @@
+"""
+Per-account portfolio state, sharded across locks by account id so trades on
+different accounts do not contend on a single global lock
+"""
+
+import copy
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+
+DEFAULT_ACCOUNT = "default"
+STARTING_BALANCE = 100000.0
+ACCOUNT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def new_portfolio() -> dict:
+    return {
+        "balance": STARTING_BALANCE,
+        "stock_balance": 0.0,
+        "holdings": []
+    }
+
+
+def shard_of(account_id: str, shards: int) -> int:
+    """
+    Stable shard index for an account (the same in every process, unlike hash())
+    """
+    return zlib.crc32(account_id.encode()) % shards
+
+
+class AccountStore:
+    """
+    Accounts are spread over `shards` independent (lock, accounts) pairs. All
+    reads and writes of an account happen under its shard's lock. Accounts are
+    only stored once a write to them succeeds; reading an unknown account
+    returns a fresh default portfolio without storing it.
+    """
+
+    def __init__(self, shards: int = 64):
+        self._shards = [(threading.Lock(), {}) for _ in range(shards)]
+
+    @staticmethod
+    def is_valid_id(account_id: str) -> bool:
+        return bool(ACCOUNT_ID_PATTERN.match(account_id))
+
+    def _shard(self, account_id: str) -> tuple:
+        return self._shards[shard_of(account_id, len(self._shards))]
+
+    @contextmanager
+    def locked(self, account_id: str):
+        """
+        Yield the account's portfolio for modification with its shard locked. A
+        new account is stored only if the block exits without raising, so
+        rejected writes do not create accounts.
+        """
+        lock, accounts = self._shard(account_id)
+        with lock:
+            state = accounts.get(account_id)
+            if state is not None:
+                yield state
+                return
+            state = new_portfolio()
+            yield state
+            accounts[account_id] = state
+
+    def snapshot(self, account_id: str) -> dict:
+        """
+        Copy of the account's portfolio that is safe to serialize after the lock is released
+        """
+        lock, accounts = self._shard(account_id)
+        with lock:
+            state = accounts.get(account_id)
+            return copy.deepcopy(state) if state is not None else new_portfolio()
+
+    def reset(self, account_id: str) -> dict:
+        # A reset account is indistinguishable from one that was never used
+        lock, accounts = self._shard(account_id)
+        with lock:
+            accounts.pop(account_id, None)
+        return new_portfolio()
+
+    def __len__(self):
+        return sum(len(accounts) for _lock, accounts in self._shards)
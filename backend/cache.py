@@ -0,0 +1,80 @@
+"""
+Small thread-safe in-memory cache with per-entry TTL and LRU eviction
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Maps keys to values that expire after `ttl` seconds. Once `maxsize` entries
+    are stored, the least recently used entry is evicted to make room.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] >= time.monotonic()
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for `key`, calling `loader()` and caching its
+        result on a miss. Concurrent callers for the same key wait for the first
+        load instead of repeating it.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                with self._lock:
+                    entry = self._data.get(key)
+                    if entry is not None and entry[0] >= time.monotonic():
+                        return entry[1]
+                value = loader()
+                self.set(key, value)
+                return value
+        finally:
+            with self._lock:
+                if self._loading.get(key) is key_lock and not key_lock.locked():
+                    del self._loading[key]
@@ -0,0 +1,56 @@
+"""
+Technical indicator formulas shared by the price predictor (ai.py) and the
+screener. Inputs are pandas Series for one ticker or (date x ticker)
+DataFrames for many; every formula works column-wise on either.
+"""
+
+
+def technical_indicators(close, high, low, volume) -> dict:
+    """
+    Every indicator as a Series/DataFrame aligned with the inputs, in the order
+    the predictor adds them as feature columns
+    """
+    ema_12 = close.ewm(span=12, adjust=False).mean()
+    ema_26 = close.ewm(span=26, adjust=False).mean()
+    macd = ema_12 - ema_26
+
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+
+    bb_middle = close.rolling(window=20).mean()
+    bb_std = close.rolling(window=20).std()
+    bb_upper = bb_middle + (bb_std * 2)
+    bb_lower = bb_middle - (bb_std * 2)
+
+    volume_sma = volume.rolling(window=20).mean()
+    price_change = close.pct_change()
+    high_20 = high.rolling(window=20).max()
+    low_20 = low.rolling(window=20).min()
+
+    return {
+        "SMA_5": close.rolling(window=5).mean(),
+        "SMA_10": close.rolling(window=10).mean(),
+        "SMA_20": close.rolling(window=20).mean(),
+        "SMA_50": close.rolling(window=50).mean(),
+        "EMA_12": ema_12,
+        "EMA_26": ema_26,
+        "MACD": macd,
+        "MACD_Signal": macd.ewm(span=9, adjust=False).mean(),
+        "RSI": 100 - (100 / (1 + rs)),
+        "BB_Middle": bb_middle,
+        "BB_Upper": bb_upper,
+        "BB_Lower": bb_lower,
+        "BB_Width": bb_upper - bb_lower,
+        "Momentum": close - close.shift(10),
+        "ROC": ((close - close.shift(10)) / close.shift(10)) * 100,
+        "Volume_SMA": volume_sma,
+        "Volume_Ratio": volume / volume_sma,
+        "Price_Change": price_change,
+        "Volatility": price_change.rolling(window=20).std(),
+        "High_20": high_20,
+        "Low_20": low_20,
+        "Distance_from_High": (high_20 - close) / close,
+        "Distance_from_Low": (close - low_20) / close,
+    }
@@ -0,0 +1,60 @@
+"""
+Deferred imports for heavy dependencies (pandas, numpy, yfinance, torch), so
+the API process can bind its port before paying for them
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that imports the real one on first attribute access
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str):
+    """
+    Return the module if it is already imported, otherwise a LazyModule for it
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def load(*modules):
+    """
+    Force the given lazy modules to import, e.g. from a background warm-up task
+    """
+    for module in modules:
+        if isinstance(module, LazyModule):
+            module._load()
@@ -1,15 +1,41 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict
-import yfinance as yf
-import pandas as pd
-import numpy as np
+from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Union
 from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import logging
+import time
 import os
 
+from backend.lazy import lazy_import, load
+from backend.cache import TTLCache
+from backend.metrics import span, count_upstream, observe_request, register_cache, render_metrics
+from backend.accounts import AccountStore, DEFAULT_ACCOUNT
+from backend.orders import OrderEngine
+from backend.replay import close_matrix, run_scenario
+from backend.screener import ScreenerIndex, SCREENER_REFRESH_SECONDS
+from backend.options_analytics import (
+    RISK_FREE_RATE,
+    DIVIDEND_YIELD,
+    prepare_contracts,
+    compute_analytics,
+    volatility_smile,
+    atm_volatility,
+)
+
+# Heavy dependencies are imported on first use (or by the startup warm-up) so
+# the worker can start serving, and pass health checks, as early as possible
+yf = lazy_import("yfinance")
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Stock Trader API")
 
 # CORS middleware
@@ -22,6 +48,19 @@ else:
     # Default to localhost for development
     cors_origins = ["http://localhost:5173", "http://localhost:3000"]
 
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template rather than raw path to keep cardinality bounded
+        route = request.scope.get("route")
+        observe_request(request.method, route.path if route else "unmatched", status, time.perf_counter() - start)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -30,12 +69,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for portfolio (in production, use a database)
-portfolio_state = {
-    "balance": 100000.0,
-    "stock_balance": 0.0,
-    "holdings": []
-}
+# Option chains cached per (ticker, expiry); the nearest expiries are prefetched
+# in the background whenever a ticker's expiration dates are requested
+OPTION_CHAIN_TTL = float(os.getenv("OPTION_CHAIN_TTL", "120"))
+OPTION_CHAIN_CACHE_SIZE = int(os.getenv("OPTION_CHAIN_CACHE_SIZE", "256"))
+OPTION_PREFETCH_COUNT = int(os.getenv("OPTION_PREFETCH_COUNT", "4"))
+option_chain_cache = TTLCache(maxsize=OPTION_CHAIN_CACHE_SIZE, ttl=OPTION_CHAIN_TTL)
+register_cache("option_chain", option_chain_cache)
+
+# Startup warm-up progress reported by /api/ready. The screener only has to
+# have attempted its first refresh; a failed download is reported, not blocking.
+readiness = {"dependencies": False, "screener": False}
+screener_error = {"last_error": None}
+
+# OHLCV history cached per (ticker, period, interval) for charts and replays
+HISTORY_TTL = float(os.getenv("HISTORY_TTL", "60"))
+HISTORY_CACHE_SIZE = int(os.getenv("HISTORY_CACHE_SIZE", "512"))
+history_cache = TTLCache(maxsize=HISTORY_CACHE_SIZE, ttl=HISTORY_TTL)
+register_cache("history", history_cache)
+
+# Latest indicator values for the screener universe, refreshed in the background
+screener_index = ScreenerIndex()
+
+# In-memory storage for portfolios (in production, use a database), one per
+# account. State is per process, so run a single uvicorn worker. Shard locks keep
+# the order matching thread from contending with trades on other accounts.
+ACCOUNT_SHARDS = int(os.getenv("ACCOUNT_SHARDS", "64"))
+accounts = AccountStore(shards=ACCOUNT_SHARDS)
+
+# Resting limit/stop orders, matched against fresh quotes every ORDER_MATCH_INTERVAL seconds
+ORDER_MATCH_INTERVAL = float(os.getenv("ORDER_MATCH_INTERVAL", "15"))
+# Filled, cancelled and rejected orders stay listable for this long (bounded by ORDER_MAX_CLOSED)
+ORDER_RETENTION_SECONDS = float(os.getenv("ORDER_RETENTION_SECONDS", "86400"))
+ORDER_MAX_CLOSED = int(os.getenv("ORDER_MAX_CLOSED", "10000"))
+order_engine = OrderEngine(retention_seconds=ORDER_RETENTION_SECONDS, max_closed=ORDER_MAX_CLOSED)
+
+# Upper bound on what-if scenarios evaluated by a single replay request
+MAX_REPLAY_SCENARIOS = int(os.getenv("MAX_REPLAY_SCENARIOS", "500"))
 
 class FundRequest(BaseModel):
     amount: float
@@ -46,30 +116,158 @@ class TradeRequest(BaseModel):
     quantity: int
     action: str  # "buy" or "sell"
 
+class OrderRequest(BaseModel):
+    stock_symbol: str
+    quantity: int
+    action: str  # "buy" or "sell"
+    order_type: str  # "limit", "stop" or "stop_limit"
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+
+class ReplayTrade(BaseModel):
+    date: str  # executes at the close of the first bar on or after this date
+    stock_symbol: str
+    quantity: int
+    action: str  # "buy" or "sell"
+
+class RebalanceRule(BaseModel):
+    weights: Dict[str, float]  # target fraction of equity per symbol, remainder held as cash
+    frequency: str = "M"  # "D", "W", "M", "Q" or "Y"
+
+class ReplayScenario(BaseModel):
+    name: Optional[str] = None
+    initial_cash: float = Field(100000.0, gt=0)
+    trades: Optional[List[ReplayTrade]] = None
+    rebalance: Optional[RebalanceRule] = None
+
+class ReplayRequest(BaseModel):
+    period: str = "1y"
+    interval: str = "1d"
+    scenarios: List[ReplayScenario]
+    include_curve: bool = True
+
 class StockDataRequest(BaseModel):
     ticker: str
     period: str
     interval: str
     view_type: str  # "price", "volume", or "both"
 
+class ScreenerFilter(BaseModel):
+    field: str
+    op: str  # "<", "<=", ">", ">=", "==" or "!="
+    value: Union[float, str]  # a number or another indicator name
+
+class ScreenerQuery(BaseModel):
+    filters: List[ScreenerFilter] = []
+    sort_by: Optional[str] = None
+    ascending: bool = True
+    limit: int = 50
+    fields: Optional[List[str]] = None
+
+# Clean NaN/NaT values and convert non-serializable types for JSON
+def clean_nan(obj):
+    if isinstance(obj, dict):
+        return {k: clean_nan(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [clean_nan(item) for item in obj]
+    elif obj is pd.NaT:
+        return None
+    elif isinstance(obj, (float, np.floating)):
+        # NaN and +/-inf are not valid JSON
+        if not np.isfinite(obj):
+            return None
+        return float(obj)
+    elif isinstance(obj, (np.integer,)):
+        return int(obj)
+    elif isinstance(obj, (np.bool_,)):
+        return bool(obj)
+    elif isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    return obj
+
+def load_history(ticker: str, period: str, interval: str):
+    # Download price data using yf.download (original working method)
+    count_upstream("download")
+    df = yf.download(ticker, period=period, interval=interval, progress=False, auto_adjust=True)
+    
+    # Handle MultiIndex if present
+    if isinstance(df.index, pd.MultiIndex):
+        df.index = df.index.droplevel(0)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.droplevel(1)
+    return df
+
+def fetch_history(ticker: str, period: str, interval: str):
+    """
+    OHLCV history shared by the chart and replay endpoints. The cached frame is
+    shared between requests, so callers must not modify it in place.
+    """
+    return history_cache.get_or_load((ticker, period, interval), lambda: load_history(ticker, period, interval))
+
+def get_spot_price(ticker: str) -> float:
+    count_upstream("history")
+    return float(yf.Ticker(ticker).history(period="1d")['Close'].iloc[-1])
+
+def get_option_dates(ticker: str) -> List[str]:
+    count_upstream("options")
+    return list(yf.Ticker(ticker).options)
+
+def require_expiration(date: str) -> str:
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Expiration date must be in YYYY-MM-DD format")
+    return date
+
+def load_option_chain(ticker: str, date: str):
+    count_upstream("option_chain")
+    return yf.Ticker(ticker).option_chain(date)
+
+def fetch_option_chain(ticker: str, date: str):
+    return option_chain_cache.get_or_load((ticker, date), lambda: load_option_chain(ticker, date))
+
+def prefetch_option_chains(ticker: str, dates: List[str]):
+    for date in dates:
+        if (ticker, date) in option_chain_cache:
+            continue
+        try:
+            fetch_option_chain(ticker, date)
+        except Exception:
+            # Prefetch is best effort; a real request will surface the error
+            pass
+
+ANALYTICS_COLUMNS = ['contractSymbol', 'strike', 'market_price', 'implied_volatility', 'moneyness', 'delta', 'gamma', 'vega', 'theta']
+
+# Format dates based on period/interval
+def format_chart_dates(index, period: str, interval: str) -> List[str]:
+    if period == "1d" and interval == "1h":
+        return index.strftime('%H:%M').tolist()
+    elif period == "5d" and interval == "4h":
+        return index.strftime('%d %H:%M').tolist()
+    elif period == "1mo" and interval == "1d":
+        return index.strftime('%d %b').tolist()
+    elif period == "6mo" and interval == "1wk":
+        return index.strftime('%b %d').tolist()
+    elif period == "ytd" and interval == "1wk":
+        return index.strftime('%b %d').tolist()
+    elif period == "1y" and interval == "1mo":
+        return index.strftime('%Y %b').tolist()
+    elif period == "5y" and interval == "3mo":
+        return index.strftime('%Y-%b').tolist()
+    else:
+        return index.strftime('%Y-%m-%d').tolist()
+
 @app.post("/api/stock/data")
 async def get_stock_data(request: StockDataRequest):
     try:
         ticker = request.ticker.upper()
-        stock = yf.Ticker(ticker)
         
-        # Download price data using yf.download (original working method)
-        df = yf.download(ticker, period=request.period, interval=request.interval, progress=False, auto_adjust=True)
+        with span("stock_data.fetch"):
+            df = await run_in_threadpool(fetch_history, ticker, request.period, request.interval)
         
         if df.empty:
             raise HTTPException(status_code=404, detail=f"No data found for {ticker}")
         
-        # Handle MultiIndex if present
-        if isinstance(df.index, pd.MultiIndex):
-            df.index = df.index.droplevel(0)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.droplevel(1)
-        
         # Validate required columns exist
         required_columns = ['Close', 'Volume']
         missing_columns = [col for col in required_columns if col not in df.columns]
@@ -83,22 +281,8 @@ async def get_stock_data(request: StockDataRequest):
         percent_change = ((price_change / old_price) * 100) if old_price != 0 else 0
         
         # Format dates based on period/interval
-        if request.period == "1d" and request.interval == "1h":
-            dates = df.index.strftime('%H:%M').tolist()
-        elif request.period == "5d" and request.interval == "4h":
-            dates = df.index.strftime('%d %H:%M').tolist()
-        elif request.period == "1mo" and request.interval == "1d":
-            dates = df.index.strftime('%d %b').tolist()
-        elif request.period == "6mo" and request.interval == "1wk":
-            dates = df.index.strftime('%b %d').tolist()
-        elif request.period == "ytd" and request.interval == "1wk":
-            dates = df.index.strftime('%b %d').tolist()
-        elif request.period == "1y" and request.interval == "1mo":
-            dates = df.index.strftime('%Y %b').tolist()
-        elif request.period == "5y" and request.interval == "3mo":
-            dates = df.index.strftime('%Y-%b').tolist()
-        else:
-            dates = df.index.strftime('%Y-%m-%d').tolist()
+        with span("stock_data.format_dates"):
+            dates = format_chart_dates(df.index, request.period, request.interval)
         
         # Prepare price data - round to 2 decimal places
         close_prices = [round(float(x), 2) if pd.notna(x) else 0.0 for x in df['Close'].tolist()]
@@ -120,13 +304,14 @@ async def get_stock_data(request: StockDataRequest):
             volume_label = "Volume"
         
         # Prepare table data - replace NaN with None for JSON serialization
-        table_df = df.round(2)
-        # Replace NaN values with None for JSON compatibility
-        table_df = table_df.where(pd.notnull(table_df), None)
-        table_data = table_df.to_dict('records')
-        table_dates = df.index.strftime('%Y-%m-%d %H:%M:%S').tolist()
+        with span("stock_data.table_records"):
+            table_df = df.round(2)
+            # Replace NaN values with None for JSON compatibility
+            table_df = table_df.where(pd.notnull(table_df), None)
+            table_data = table_df.to_dict('records')
+            table_dates = df.index.strftime('%Y-%m-%d %H:%M:%S').tolist()
         
-        return {
+        payload = {
             "ticker": ticker,
             "current_price": round(new_price, 2),
             "price_change": round(price_change, 2),
@@ -139,18 +324,25 @@ async def get_stock_data(request: StockDataRequest):
             "table_dates": table_dates,
             "view_type": request.view_type
         }
+        
+        # Encode here rather than in FastAPI so serialization shows up as its own stage
+        with span("stock_data.json_encode"):
+            return JSONResponse(content=jsonable_encoder(payload))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/stock/options/{ticker}")
-async def get_stock_options(ticker: str):
+async def get_stock_options(ticker: str, background_tasks: BackgroundTasks):
     try:
-        stock = yf.Ticker(ticker.upper())
-        options_dates = stock.options
+        options_dates = await run_in_threadpool(get_option_dates, ticker.upper())
         
         if not options_dates:
             return {"ticker": ticker.upper(), "options_dates": [], "message": "No options data available"}
         
+        # Warm the cache for the expiries users are most likely to click next
+        if OPTION_PREFETCH_COUNT > 0:
+            background_tasks.add_task(prefetch_option_chains, ticker.upper(), list(options_dates[:OPTION_PREFETCH_COUNT]))
+        
         return {
             "ticker": ticker.upper(),
             "options_dates": list(options_dates)
@@ -158,39 +350,97 @@ async def get_stock_options(ticker: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Registered before the chain route so "surface" is not taken as an expiration date
+@app.get("/api/stock/options/{ticker}/surface")
+async def get_volatility_surface(ticker: str):
+    try:
+        ticker = ticker.upper()
+        options_dates = await run_in_threadpool(get_option_dates, ticker)
+        if not options_dates:
+            return {"ticker": ticker, "expirations": [], "message": "No options data available"}
+        
+        # Fetch every expiry concurrently, then solve the whole surface in one vectorized pass
+        spot, *chains = await asyncio.gather(
+            run_in_threadpool(get_spot_price, ticker),
+            *(run_in_threadpool(fetch_option_chain, ticker, date) for date in options_dates),
+            return_exceptions=True,
+        )
+        if isinstance(spot, Exception):
+            raise spot
+        
+        frames = [
+            prepare_contracts(chain.calls, chain.puts, date)
+            for date, chain in zip(options_dates, chains)
+            if not isinstance(chain, Exception)
+        ]
+        if not frames:
+            raise HTTPException(status_code=502, detail=f"Could not fetch any option chains for {ticker}")
+        analyzed = compute_analytics(pd.concat(frames, ignore_index=True), spot)
+        
+        expirations = []
+        for date, group in analyzed.groupby("expiration", sort=True):
+            expirations.append({
+                "expiration_date": date,
+                "time_to_expiry": float(group["t"].iloc[0]),
+                "atm_iv": atm_volatility(group, spot),
+                "smile": volatility_smile(group, spot),
+            })
+        
+        return clean_nan({
+            "ticker": ticker,
+            "spot": spot,
+            "risk_free_rate": RISK_FREE_RATE,
+            "dividend_yield": DIVIDEND_YIELD,
+            "contracts": len(analyzed),
+            "expirations": expirations,
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/stock/options/{ticker}/{date}/analytics")
+async def get_option_analytics(ticker: str, date: str):
+    require_expiration(date)
+    try:
+        ticker = ticker.upper()
+        spot, option_chain = await asyncio.gather(
+            run_in_threadpool(get_spot_price, ticker),
+            run_in_threadpool(fetch_option_chain, ticker, date),
+        )
+        analyzed = compute_analytics(prepare_contracts(option_chain.calls, option_chain.puts, date), spot)
+        calls = analyzed[analyzed["option_type"] == "call"]
+        puts = analyzed[analyzed["option_type"] == "put"]
+        
+        return clean_nan({
+            "ticker": ticker,
+            "expiration_date": date,
+            "spot": spot,
+            "risk_free_rate": RISK_FREE_RATE,
+            "dividend_yield": DIVIDEND_YIELD,
+            "time_to_expiry": float(analyzed["t"].iloc[0]) if len(analyzed) else None,
+            "atm_iv": atm_volatility(analyzed, spot),
+            "calls": calls[ANALYTICS_COLUMNS].to_dict('records'),
+            "puts": puts[ANALYTICS_COLUMNS].to_dict('records'),
+            "smile": volatility_smile(analyzed, spot),
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/stock/options/{ticker}/{date}")
 async def get_option_chain(ticker: str, date: str):
     try:
-        stock = yf.Ticker(ticker.upper())
-        option_chain = stock.option_chain(date)
+        option_chain = await run_in_threadpool(fetch_option_chain, ticker.upper(), date)
         
         # Replace NaN values with None for JSON serialization
         # Convert to dict first, then clean NaN values
-        calls_dict = option_chain.calls.to_dict('records')
-        puts_dict = option_chain.puts.to_dict('records')
-        
-        # Clean NaN/NaT values and convert non-serializable types for JSON
-        def clean_nan(obj):
-            if isinstance(obj, dict):
-                return {k: clean_nan(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [clean_nan(item) for item in obj]
-            elif obj is pd.NaT:
-                return None
-            elif isinstance(obj, (float, np.floating)):
-                if pd.isna(obj):
-                    return None
-                return float(obj)
-            elif isinstance(obj, (np.integer,)):
-                return int(obj)
-            elif isinstance(obj, (np.bool_,)):
-                return bool(obj)
-            elif isinstance(obj, pd.Timestamp):
-                return obj.isoformat()
-            return obj
-        
-        calls = clean_nan(calls_dict)
-        puts = clean_nan(puts_dict)
+        with span("option_chain.to_dict"):
+            calls_dict = option_chain.calls.to_dict('records')
+            puts_dict = option_chain.puts.to_dict('records')
+        
+        with span("option_chain.clean_nan"):
+            calls = clean_nan(calls_dict)
+            puts = clean_nan(puts_dict)
         
         return {
             "ticker": ticker.upper(),
@@ -201,108 +451,317 @@ async def get_option_chain(ticker: str, date: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def refresh_screener_index():
+    while True:
+        try:
+            await run_in_threadpool(screener_index.refresh)
+            screener_error["last_error"] = None
+        except Exception as e:
+            logger.exception("Screener refresh failed: %s", e)
+            screener_error["last_error"] = str(e)
+        readiness["screener"] = True
+        await asyncio.sleep(SCREENER_REFRESH_SECONDS)
+
+async def warm_up():
+    # Import heavy dependencies off the event loop, then start background refreshes
+    await run_in_threadpool(load, pd, np, yf)
+    readiness["dependencies"] = True
+    app.state.screener_task = asyncio.create_task(refresh_screener_index())
+    app.state.order_matching_task = asyncio.create_task(match_orders_periodically())
+
+@app.on_event("startup")
+async def start_warm_up():
+    app.state.warm_up_task = asyncio.create_task(warm_up())
+
+@app.get("/api/ready")
+async def get_readiness():
+    ready = all(readiness.values())
+    components = {
+        **readiness,
+        "screener_loaded": screener_index.ready,
+        "screener_error": screener_error["last_error"],
+    }
+    return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, "components": components})
+
+@app.post("/api/screener/query")
+async def query_screener(request: ScreenerQuery):
+    if not screener_index.ready:
+        raise HTTPException(status_code=503, detail="Screener index is still loading, try again shortly")
+    if request.limit <= 0:
+        raise HTTPException(status_code=400, detail="Limit must be greater than 0")
+    try:
+        result = screener_index.query(
+            [f.model_dump() for f in request.filters],
+            sort_by=request.sort_by,
+            ascending=request.ascending,
+            limit=request.limit,
+            fields=request.fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return clean_nan(result)
+
+@app.get("/metrics")
+async def get_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+def require_account(account_id: str) -> str:
+    if not accounts.is_valid_id(account_id):
+        raise HTTPException(status_code=400, detail="Account id must be 1-64 letters, digits, '-' or '_'")
+    return account_id
+
+# Legacy single-portfolio routes, kept for older clients, all share the default
+# account; the frontend uses the per-account routes below
 @app.get("/api/portfolio")
 async def get_portfolio():
-    return portfolio_state
+    return await get_account_portfolio(DEFAULT_ACCOUNT)
 
 @app.post("/api/portfolio/funds")
 async def manage_funds(request: FundRequest):
+    return await manage_account_funds(DEFAULT_ACCOUNT, request)
+
+@app.post("/api/portfolio/trade")
+async def execute_trade(request: TradeRequest):
+    return await execute_account_trade(DEFAULT_ACCOUNT, request)
+
+@app.post("/api/portfolio/reset")
+async def reset_portfolio():
+    return await reset_account_portfolio(DEFAULT_ACCOUNT)
+
+@app.get("/api/accounts/{account_id}/portfolio")
+async def get_account_portfolio(account_id: str):
+    return accounts.snapshot(require_account(account_id))
+
+@app.post("/api/accounts/{account_id}/funds")
+async def manage_account_funds(account_id: str, request: FundRequest):
+    require_account(account_id)
     if request.amount <= 0:
         raise HTTPException(status_code=400, detail="Amount must be greater than 0")
     
-    if request.action == "add":
-        portfolio_state["balance"] += request.amount
-    elif request.action == "withdraw":
-        if request.amount > portfolio_state["balance"]:
-            raise HTTPException(status_code=400, detail="Insufficient balance")
-        portfolio_state["balance"] -= request.amount
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'add' or 'withdraw'")
+    with accounts.locked(account_id) as state:
+        if request.action == "add":
+            state["balance"] += request.amount
+        elif request.action == "withdraw":
+            if request.amount > state["balance"]:
+                raise HTTPException(status_code=400, detail="Insufficient balance")
+            state["balance"] -= request.amount
+        else:
+            raise HTTPException(status_code=400, detail="Invalid action. Use 'add' or 'withdraw'")
     
-    return {"message": f"Funds {request.action}ed successfully", "portfolio": portfolio_state}
+    return {"message": f"Funds {request.action}ed successfully", "portfolio": accounts.snapshot(account_id)}
 
-@app.post("/api/portfolio/trade")
-async def execute_trade(request: TradeRequest):
+def apply_trade(state: dict, stock_symbol: str, quantity: int, action: str, price: float):
+    """
+    Buy or sell `quantity` shares at `price`, updating balances and holdings.
+    Callers must hold the account's lock (see AccountStore.locked).
+    """
+    if quantity <= 0:
+        raise HTTPException(status_code=400, detail="Quantity must be greater than 0")
+    total_cost = price * quantity
+    
+    if action == "buy":
+        if total_cost > state["balance"]:
+            raise HTTPException(status_code=400, detail="Insufficient balance to complete the purchase")
+        
+        state["balance"] -= total_cost
+        state["stock_balance"] += total_cost
+        
+        # Update holdings
+        holding_exists = False
+        for holding in state["holdings"]:
+            if holding["stock"] == stock_symbol:
+                holding["shares"] += quantity
+                holding["total_cost"] += total_cost
+                holding_exists = True
+                break
+        
+        if not holding_exists:
+            state["holdings"].append({
+                "stock": stock_symbol,
+                "shares": quantity,
+                "total_cost": total_cost
+            })
+    
+    elif action == "sell":
+        # Find holding
+        holding = None
+        for h in state["holdings"]:
+            if h["stock"] == stock_symbol:
+                holding = h
+                break
+        
+        if not holding:
+            raise HTTPException(status_code=400, detail=f"You don't own any shares of {stock_symbol}")
+        
+        if quantity > holding["shares"]:
+            raise HTTPException(status_code=400, detail=f"You only own {holding['shares']} shares of {stock_symbol}")
+        
+        state["balance"] += total_cost
+        state["stock_balance"] -= total_cost
+        
+        # Update holding
+        holding["shares"] -= quantity
+        holding["total_cost"] -= total_cost
+        
+        # Remove if no shares left
+        if holding["shares"] == 0:
+            state["holdings"].remove(holding)
+    else:
+        raise HTTPException(status_code=400, detail="Invalid action. Use 'buy' or 'sell'")
+
+@app.post("/api/accounts/{account_id}/trade")
+async def execute_account_trade(account_id: str, request: TradeRequest):
+    require_account(account_id)
     try:
         stock_symbol = request.stock_symbol.upper()
-        stock = yf.Ticker(stock_symbol)
-        
-        # Get current price (original working method)
-        current_price = stock.history(period="1d")['Close'].iloc[-1]
-        
-        total_cost = current_price * request.quantity
-        
-        if request.action == "buy":
-            if total_cost > portfolio_state["balance"]:
-                raise HTTPException(status_code=400, detail="Insufficient balance to complete the purchase")
-            
-            portfolio_state["balance"] -= total_cost
-            portfolio_state["stock_balance"] += total_cost
-            
-            # Update holdings
-            holding_exists = False
-            for holding in portfolio_state["holdings"]:
-                if holding["stock"] == stock_symbol:
-                    holding["shares"] += request.quantity
-                    holding["total_cost"] += total_cost
-                    holding_exists = True
-                    break
-            
-            if not holding_exists:
-                portfolio_state["holdings"].append({
-                    "stock": stock_symbol,
-                    "shares": request.quantity,
-                    "total_cost": total_cost
-                })
-            
-            return {
-                "message": f"Bought {request.quantity} shares of {stock_symbol} at ${current_price:.2f} each",
-                "portfolio": portfolio_state
-            }
-        
-        elif request.action == "sell":
-            # Find holding
-            holding = None
-            for h in portfolio_state["holdings"]:
-                if h["stock"] == stock_symbol:
-                    holding = h
-                    break
-            
-            if not holding:
-                raise HTTPException(status_code=400, detail=f"You don't own any shares of {stock_symbol}")
-            
-            if request.quantity > holding["shares"]:
-                raise HTTPException(status_code=400, detail=f"You only own {holding['shares']} shares of {stock_symbol}")
-            
-            portfolio_state["balance"] += total_cost
-            portfolio_state["stock_balance"] -= total_cost
-            
-            # Update holding
-            holding["shares"] -= request.quantity
-            holding["total_cost"] -= total_cost
-            
-            # Remove if no shares left
-            if holding["shares"] == 0:
-                portfolio_state["holdings"].remove(holding)
-            
-            return {
-                "message": f"Sold {request.quantity} shares of {stock_symbol} at ${current_price:.2f} each",
-                "portfolio": portfolio_state
-            }
-        else:
-            raise HTTPException(status_code=400, detail="Invalid action. Use 'buy' or 'sell'")
+        
+        # Get current price off the event loop (original working method)
+        current_price = await run_in_threadpool(get_spot_price, stock_symbol)
+        
+        # Only the account's shard is locked, and never across the network call above
+        with accounts.locked(account_id) as state:
+            apply_trade(state, stock_symbol, request.quantity, request.action, current_price)
+        
+        verb = "Bought" if request.action == "buy" else "Sold"
+        return {
+            "message": f"{verb} {request.quantity} shares of {stock_symbol} at ${current_price:.2f} each",
+            "portfolio": accounts.snapshot(account_id)
+        }
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/portfolio/reset")
-async def reset_portfolio():
-    portfolio_state["balance"] = 100000.0
-    portfolio_state["stock_balance"] = 0.0
-    portfolio_state["holdings"] = []
-    return {"message": "Portfolio reset successfully", "portfolio": portfolio_state}
+@app.post("/api/accounts/{account_id}/reset")
+async def reset_account_portfolio(account_id: str):
+    portfolio = accounts.reset(require_account(account_id))
+    return {"message": "Portfolio reset successfully", "portfolio": portfolio}
+
+def fetch_latest_prices(symbols: List[str]) -> Dict[str, float]:
+    count_upstream("download")
+    df = yf.download(symbols, period="1d", interval="1m", progress=False, auto_adjust=True, group_by="column")
+    if df.empty:
+        return {}
+    close = df["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(symbols[0])
+    latest = close.ffill().iloc[-1]
+    return {symbol: float(price) for symbol, price in latest.items() if pd.notna(price)}
+
+def match_orders(prices: Dict[str, float]) -> int:
+    """
+    Execute resting orders against the latest prices, applying each fill to the
+    owning account atomically. Returns the number of orders filled.
+    """
+    filled = 0
+    for symbol, price in prices.items():
+        for order in order_engine.match(symbol, price):
+            try:
+                with accounts.locked(order["account_id"]) as state:
+                    apply_trade(state, order["stock"], order["quantity"], order["action"], price)
+            except HTTPException as e:
+                order_engine.mark_rejected(order, e.detail)
+                continue
+            except Exception as e:
+                # Never leave a popped order stuck in "filling"
+                logger.exception("Fill of order %s failed: %s", order["id"], e)
+                order_engine.mark_rejected(order, f"Fill failed: {e}")
+                continue
+            order_engine.mark_filled(order, price)
+            filled += 1
+    return filled
+
+def run_order_matching():
+    symbols = order_engine.symbols()
+    if symbols:
+        with span("orders.match_tick"):
+            match_orders(fetch_latest_prices(symbols))
+
+async def match_orders_periodically():
+    while True:
+        try:
+            await run_in_threadpool(run_order_matching)
+        except Exception as e:
+            logger.exception("Order matching failed: %s", e)
+        await asyncio.sleep(ORDER_MATCH_INTERVAL)
+
+@app.post("/api/portfolio/replay")
+async def replay_portfolio(request: ReplayRequest):
+    if not request.scenarios:
+        raise HTTPException(status_code=400, detail="At least one scenario is required")
+    if len(request.scenarios) > MAX_REPLAY_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_REPLAY_SCENARIOS} scenarios per request")
+    
+    scenarios = [scenario.model_dump() for scenario in request.scenarios]
+    symbols = sorted(
+        {trade["stock_symbol"].upper() for s in scenarios for trade in (s["trades"] or [])}
+        | {symbol.upper() for s in scenarios if s["rebalance"] for symbol in s["rebalance"]["weights"]}
+    )
+    if not symbols:
+        raise HTTPException(status_code=400, detail="Scenarios must reference at least one symbol")
+    
+    try:
+        # Every symbol is fetched once (usually from the history cache) and shared by all scenarios
+        with span("replay.fetch"):
+            histories = await asyncio.gather(
+                *(run_in_threadpool(fetch_history, symbol, request.period, request.interval) for symbol in symbols)
+            )
+        prices = close_matrix({symbol: df for symbol, df in zip(symbols, histories) if not df.empty})
+        
+        with span("replay.simulate"):
+            results = await asyncio.gather(
+                *(run_in_threadpool(run_scenario, prices, scenario, request.include_curve) for scenario in scenarios)
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return clean_nan({"period": request.period, "interval": request.interval, "scenarios": results})
+
+@app.post("/api/orders")
+async def place_order(request: OrderRequest):
+    return await place_account_order(DEFAULT_ACCOUNT, request)
+
+@app.get("/api/orders")
+async def get_orders(status: Optional[str] = None):
+    return await get_account_orders(DEFAULT_ACCOUNT, status)
+
+@app.delete("/api/orders/{order_id}")
+async def cancel_order(order_id: str):
+    return await cancel_account_order(DEFAULT_ACCOUNT, order_id)
+
+@app.post("/api/accounts/{account_id}/orders")
+async def place_account_order(account_id: str, request: OrderRequest):
+    require_account(account_id)
+    try:
+        order = order_engine.submit(
+            request.stock_symbol,
+            request.quantity,
+            request.action,
+            request.order_type,
+            limit_price=request.limit_price,
+            stop_price=request.stop_price,
+            account_id=account_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": f"{request.order_type.replace('_', '-').capitalize()} order placed", "order": order}
+
+@app.get("/api/accounts/{account_id}/orders")
+async def get_account_orders(account_id: str, status: Optional[str] = None):
+    return {"orders": order_engine.list_orders(status, account_id=require_account(account_id))}
+
+@app.delete("/api/accounts/{account_id}/orders/{order_id}")
+async def cancel_account_order(account_id: str, order_id: str):
+    require_account(account_id)
+    try:
+        order = order_engine.cancel(order_id, account_id=account_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Order not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Order cancelled", "order": order}
 
 # Serve static files (frontend) in production
 # IMPORTANT: This must be registered AFTER all API routes so the catch-all
@@ -325,7 +784,7 @@ if os.path.exists(frontend_dist_path):
     @app.get("/{full_path:path}")
     async def serve_frontend(full_path: str):
         # Don't serve frontend for API routes or docs
-        if full_path.startswith("api") or full_path.startswith("docs") or full_path.startswith("openapi.json") or full_path.startswith("assets"):
+        if full_path.startswith("api") or full_path.startswith("metrics") or full_path.startswith("docs") or full_path.startswith("openapi.json") or full_path.startswith("assets"):
             raise HTTPException(status_code=404, detail="Not found")
 
         # Serve index.html for all other routes (SPA routing)
@@ -0,0 +1,106 @@
+"""
+Prometheus metrics for request latency, per-stage spans, upstream data calls,
+cache effectiveness and model training throughput
+"""
+
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LATENCY = Histogram(
+    "stock_trader_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "stock_trader_stage_duration_seconds",
+    "Latency of individual stages inside handlers and the predictor",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_CALLS = Counter(
+    "stock_trader_upstream_calls_total",
+    "Calls made to the upstream market data provider",
+    ["call"],
+)
+TRAINING_EPOCHS = Counter(
+    "stock_trader_training_epochs_total",
+    "Training epochs completed",
+    ["model"],
+)
+TRAINING_EPOCHS_PER_SECOND = Gauge(
+    "stock_trader_training_epochs_per_second",
+    "Epochs per second of the most recent training run",
+    ["model"],
+)
+
+
+@contextmanager
+def span(stage: str):
+    """
+    Time a block (or, used as a decorator, a function call) as a named stage
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+def count_upstream(call: str):
+    UPSTREAM_CALLS.labels(call).inc()
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(seconds)
+
+
+def record_training(model: str, epochs: int, seconds: float):
+    TRAINING_EPOCHS.labels(model).inc(epochs)
+    if seconds > 0:
+        TRAINING_EPOCHS_PER_SECOND.labels(model).set(epochs / seconds)
+
+
+class CacheCollector:
+    """
+    Reads hit/miss counters from registered TTLCache instances at scrape time
+    """
+
+    def __init__(self):
+        self.caches = {}
+
+    def collect(self):
+        hits = CounterMetricFamily("stock_trader_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("stock_trader_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("stock_trader_cache_hit_ratio", "Cache hits / lookups since start", labels=["cache"])
+        entries = GaugeMetricFamily("stock_trader_cache_entries", "Entries currently cached", labels=["cache"])
+        for name, cache in self.caches.items():
+            lookups = cache.hits + cache.misses
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            ratio.add_metric([name], cache.hits / lookups if lookups else 0.0)
+            entries.add_metric([name], len(cache))
+        yield hits
+        yield misses
+        yield ratio
+        yield entries
+
+
+_cache_collector = CacheCollector()
+REGISTRY.register(_cache_collector)
+
+
+def register_cache(name: str, cache):
+    _cache_collector.caches[name] = cache
+
+
+def render_metrics() -> tuple:
+    """
+    Prometheus text exposition of every metric, with its content type
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,230 @@
+"""
+Options analytics: Black-Scholes implied volatility, Greeks and volatility smiles.
+Every function works on whole arrays of contracts at once so a full chain (or a
+full surface of chains) is solved in a single vectorized pass.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from datetime import datetime, time, timezone
+from zoneinfo import ZoneInfo
+
+from backend.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", "0.04"))
+DIVIDEND_YIELD = float(os.getenv("DIVIDEND_YIELD", "0.0"))
+
+# Implied volatility search bracket (0.01% to 500%)
+IV_LOWER = 1e-4
+IV_UPPER = 5.0
+
+_MARKET_CLOSE = time(16, 0)
+_MARKET_TZ = ZoneInfo("America/New_York")
+_SECONDS_PER_YEAR = 365.0 * 24 * 60 * 60
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+def norm_pdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def norm_cdf(x):
+    """
+    Standard normal CDF (Abramowitz & Stegun 26.2.17, abs. error < 7.5e-8)
+    """
+    x = np.asarray(x, dtype=float)
+    t = 1.0 / (1.0 + 0.2316419 * np.abs(x))
+    poly = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    upper_tail = norm_pdf(x) * poly
+    return np.where(x >= 0, 1.0 - upper_tail, upper_tail)
+
+
+def time_to_expiry(expiration: str, now: datetime = None) -> float:
+    """
+    Year fraction until the 4pm New York close on the expiration date
+    """
+    expiry = datetime.combine(datetime.strptime(expiration, "%Y-%m-%d").date(), _MARKET_CLOSE, tzinfo=_MARKET_TZ)
+    now = now if now else datetime.now(timezone.utc)
+    return max((expiry - now).total_seconds(), 0.0) / _SECONDS_PER_YEAR
+
+
+def _d1_d2(spot, strike, t, sigma, r, q):
+    vol_sqrt_t = sigma * np.sqrt(t)
+    d1 = (np.log(spot / strike) + (r - q + 0.5 * sigma * sigma) * t) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def black_scholes_price(spot, strike, t, sigma, is_call, r=RISK_FREE_RATE, q=DIVIDEND_YIELD):
+    d1, d2 = _d1_d2(spot, strike, t, sigma, r, q)
+    disc_spot = spot * np.exp(-q * t)
+    disc_strike = strike * np.exp(-r * t)
+    call = disc_spot * norm_cdf(d1) - disc_strike * norm_cdf(d2)
+    put = disc_strike * norm_cdf(-d2) - disc_spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def implied_volatility(price, spot, strike, t, is_call, r=RISK_FREE_RATE, q=DIVIDEND_YIELD, tol=1e-8, max_iter=100):
+    """
+    Solve Black-Scholes implied volatility for every contract at once.
+
+    Safeguarded Newton iteration: each contract keeps a [lo, hi] bracket that is
+    tightened on every step, and any Newton step that leaves the bracket (or has
+    a vanishing vega) falls back to bisection. Contracts priced outside the
+    no-arbitrage bounds, or that do not converge, get NaN.
+    """
+    price, spot, strike, t, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=float),
+        np.asarray(spot, dtype=float),
+        np.asarray(strike, dtype=float),
+        np.asarray(t, dtype=float),
+        np.asarray(is_call, dtype=bool),
+    )
+    price, spot, strike, t, is_call = (a.ravel() for a in (price, spot, strike, t, is_call))
+    n = price.size
+    sigma = np.full(n, np.nan)
+    if n == 0:
+        return sigma
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        disc_spot = spot * np.exp(-q * t)
+        disc_strike = strike * np.exp(-r * t)
+        lower_bound = np.where(is_call, np.maximum(disc_spot - disc_strike, 0.0), np.maximum(disc_strike - disc_spot, 0.0))
+        upper_bound = np.where(is_call, disc_spot, disc_strike)
+        valid = (
+            np.isfinite(price) & np.isfinite(spot) & np.isfinite(strike)
+            & (t > 0) & (spot > 0) & (strike > 0)
+            & (price > lower_bound) & (price < upper_bound)
+        )
+
+        idx = np.flatnonzero(valid)
+        lo = np.full(idx.size, IV_LOWER)
+        hi = np.full(idx.size, IV_UPPER)
+        # Manaster-Koehler starting point, kept inside the bracket
+        guess = np.sqrt(2.0 * np.abs(np.log(spot[idx] / strike[idx]) + (r - q) * t[idx]) / t[idx])
+        vol = np.clip(guess, 0.05, 3.0)
+
+        for _ in range(max_iter):
+            if idx.size == 0:
+                break
+            s, k, tt, c = spot[idx], strike[idx], t[idx], is_call[idx]
+            d1, _d2 = _d1_d2(s, k, tt, vol, r, q)
+            diff = black_scholes_price(s, k, tt, vol, c, r, q) - price[idx]
+            vega = s * np.exp(-q * tt) * norm_pdf(d1) * np.sqrt(tt)
+
+            done = np.abs(diff) < tol
+            sigma[idx[done]] = vol[done]
+
+            hi = np.where(diff > 0, vol, hi)
+            lo = np.where(diff <= 0, vol, lo)
+            step = vol - diff / vega
+            bisect = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+            vol = np.where(bisect, 0.5 * (lo + hi), step)
+
+            # Bracket collapsed without hitting the price: treat as converged
+            collapsed = ~done & ((hi - lo) < tol)
+            sigma[idx[collapsed]] = vol[collapsed]
+
+            keep = ~(done | collapsed)
+            idx, lo, hi, vol = idx[keep], lo[keep], hi[keep], vol[keep]
+
+    # Solutions pinned to the search limits are not meaningful
+    sigma[(sigma <= IV_LOWER * 1.0001) | (sigma >= IV_UPPER * 0.9999)] = np.nan
+    return sigma
+
+
+def greeks(spot, strike, t, sigma, is_call, r=RISK_FREE_RATE, q=DIVIDEND_YIELD) -> dict:
+    """
+    Black-Scholes Greeks. Vega is per 1 vol point and theta is per calendar day.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1, d2 = _d1_d2(spot, strike, t, sigma, r, q)
+        sqrt_t = np.sqrt(t)
+        disc_q = np.exp(-q * t)
+        disc_r = np.exp(-r * t)
+        pdf_d1 = norm_pdf(d1)
+
+        delta = np.where(is_call, disc_q * norm_cdf(d1), disc_q * (norm_cdf(d1) - 1.0))
+        gamma = disc_q * pdf_d1 / (spot * sigma * sqrt_t)
+        vega = spot * disc_q * pdf_d1 * sqrt_t / 100.0
+
+        decay = -spot * disc_q * pdf_d1 * sigma / (2.0 * sqrt_t)
+        call_theta = decay - r * strike * disc_r * norm_cdf(d2) + q * spot * disc_q * norm_cdf(d1)
+        put_theta = decay + r * strike * disc_r * norm_cdf(-d2) - q * spot * disc_q * norm_cdf(-d1)
+        theta = np.where(is_call, call_theta, put_theta) / 365.0
+
+    return {"delta": delta, "gamma": gamma, "vega": vega, "theta": theta}
+
+
+def market_price(contracts: pd.DataFrame) -> np.ndarray:
+    """
+    Bid/ask midpoint where a two-sided quote exists, otherwise the last trade
+    """
+    bid = contracts["bid"].to_numpy(dtype=float, na_value=np.nan)
+    ask = contracts["ask"].to_numpy(dtype=float, na_value=np.nan)
+    last = contracts["lastPrice"].to_numpy(dtype=float, na_value=np.nan)
+    two_sided = (bid > 0) & (ask > 0) & (ask >= bid)
+    return np.where(two_sided, 0.5 * (bid + ask), last)
+
+
+def prepare_contracts(calls: pd.DataFrame, puts: pd.DataFrame, expiration: str, now: datetime = None) -> pd.DataFrame:
+    """
+    Stack a yfinance option chain into one frame of contracts ready for analysis
+    """
+    t = time_to_expiry(expiration, now)
+    frames = []
+    for option_type, frame in (("call", calls), ("put", puts)):
+        if frame is None or frame.empty:
+            continue
+        frames.append(pd.DataFrame({
+            "contractSymbol": frame["contractSymbol"].to_numpy(),
+            "option_type": option_type,
+            "expiration": expiration,
+            "strike": frame["strike"].to_numpy(dtype=float),
+            "market_price": market_price(frame),
+            "t": t,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["contractSymbol", "option_type", "expiration", "strike", "market_price", "t"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_analytics(contracts: pd.DataFrame, spot: float, r: float = RISK_FREE_RATE, q: float = DIVIDEND_YIELD) -> pd.DataFrame:
+    """
+    Add implied volatility and Greeks columns to a frame from prepare_contracts
+    """
+    df = contracts.copy()
+    strike = df["strike"].to_numpy(dtype=float)
+    t = df["t"].to_numpy(dtype=float)
+    is_call = (df["option_type"] == "call").to_numpy()
+
+    iv = implied_volatility(df["market_price"].to_numpy(dtype=float), spot, strike, t, is_call, r, q)
+    df["implied_volatility"] = iv
+    df["moneyness"] = strike / spot
+    for name, values in greeks(spot, strike, t, iv, is_call, r, q).items():
+        df[name] = values
+    return df
+
+
+def volatility_smile(analyzed: pd.DataFrame, spot: float) -> list:
+    """
+    Out-of-the-money smile for a single expiry: puts below spot, calls at or above
+    """
+    otm = np.where(analyzed["strike"] < spot, analyzed["option_type"] == "put", analyzed["option_type"] == "call")
+    smile = analyzed.loc[otm & analyzed["implied_volatility"].notna(), ["strike", "moneyness", "implied_volatility", "option_type"]]
+    return smile.sort_values("strike").to_dict("records")
+
+
+def atm_volatility(analyzed: pd.DataFrame, spot: float) -> float:
+    """
+    Implied volatility of the contract struck closest to spot
+    """
+    quoted = analyzed[analyzed["implied_volatility"].notna()]
+    if quoted.empty:
+        return float("nan")
+    nearest = (quoted["strike"] - spot).abs().idxmin()
+    return float(quoted.loc[nearest, "implied_volatility"])
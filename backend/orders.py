@@ -0,0 +1,232 @@
+"""
+Simulated order book for limit, stop and stop-limit orders.
+
+Resting orders are kept in per-symbol heaps keyed by their trigger price, so a
+price tick only touches the orders that actually execute (O(k log n) for k
+fills) instead of scanning every open order. Cancelled orders are dropped
+lazily when they reach the top of a heap, and a book's heaps are rebuilt once
+cancelled entries make up most of them. Closed (filled, cancelled or
+rejected) orders stay listable for a retention window and are then evicted.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+ORDER_TYPES = ("limit", "stop", "stop_limit")
+OPEN_STATUSES = ("open", "triggered")
+
+
+class OrderBook:
+    """
+    Heaps for one symbol. Every heap is ordered so its top is the next order to
+    execute: buy limits fill when price <= limit (highest limit first), sell
+    limits when price >= limit (lowest first), buy stops trigger when
+    price >= stop (lowest first) and sell stops when price <= stop (highest first).
+    """
+
+    def __init__(self):
+        self.buy_limits = []
+        self.sell_limits = []
+        self.buy_stops = []
+        self.sell_stops = []
+        self.open_orders = 0
+        # Cancelled entries still sitting in the heaps
+        self.stale = 0
+
+    def push_limit(self, order: dict, seq: int):
+        if order["action"] == "buy":
+            heapq.heappush(self.buy_limits, (-order["limit_price"], seq, order))
+        else:
+            heapq.heappush(self.sell_limits, (order["limit_price"], seq, order))
+
+    def push_stop(self, order: dict, seq: int):
+        if order["action"] == "buy":
+            heapq.heappush(self.buy_stops, (order["stop_price"], seq, order))
+        else:
+            heapq.heappush(self.sell_stops, (-order["stop_price"], seq, order))
+
+    def _heaps(self) -> tuple:
+        return (self.buy_limits, self.sell_limits, self.buy_stops, self.sell_stops)
+
+    def discard(self):
+        """
+        Account for an order cancelled in place, compacting the heaps when more
+        than half of their entries are cancelled
+        """
+        self.open_orders -= 1
+        self.stale += 1
+        if self.stale * 2 > sum(len(heap) for heap in self._heaps()):
+            self.compact()
+
+    def compact(self):
+        for heap in self._heaps():
+            heap[:] = [entry for entry in heap if entry[2]["status"] in OPEN_STATUSES]
+            heapq.heapify(heap)
+        self.stale = 0
+
+    def _pop_while(self, heap: list, crossed) -> list:
+        popped = []
+        while heap:
+            key, _seq, order = heap[0]
+            if order["status"] not in OPEN_STATUSES:
+                heapq.heappop(heap)
+                self.stale -= 1
+                continue
+            if not crossed(key):
+                break
+            heapq.heappop(heap)
+            popped.append(order)
+        return popped
+
+    def triggered_stops(self, price: float) -> list:
+        return (
+            self._pop_while(self.buy_stops, lambda stop: price >= stop)
+            + self._pop_while(self.sell_stops, lambda neg_stop: price <= -neg_stop)
+        )
+
+    def marketable_limits(self, price: float) -> list:
+        return (
+            self._pop_while(self.buy_limits, lambda neg_limit: price <= -neg_limit)
+            + self._pop_while(self.sell_limits, lambda limit: price >= limit)
+        )
+
+
+class OrderEngine:
+    """
+    Holds every order and the per-symbol books. match() is called with each new
+    quote and returns the orders that should be filled at that price; the
+    caller applies the fills to the portfolio and reports back with
+    mark_filled() or mark_rejected().
+
+    Closed orders are evicted once they are older than `retention_seconds`, or
+    oldest first when more than `max_closed` of them are kept.
+    """
+
+    def __init__(self, retention_seconds: float = 86400.0, max_closed: int = 10000):
+        self.orders = {}
+        self.books = {}
+        self.retention_seconds = retention_seconds
+        self.max_closed = max_closed
+        # (closed at, order id) in the order the orders were closed
+        self._closed = deque()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _close(self, order: dict):
+        """
+        Record that an order left the book; the lock must be held
+        """
+        self._closed.append((time.monotonic(), order["id"]))
+        self._evict_closed()
+
+    def _evict_closed(self):
+        cutoff = time.monotonic() - self.retention_seconds
+        while self._closed and (self._closed[0][0] < cutoff or len(self._closed) > self.max_closed):
+            _closed_at, order_id = self._closed.popleft()
+            self.orders.pop(order_id, None)
+
+    def submit(self, stock_symbol: str, quantity: int, action: str, order_type: str,
+               limit_price: float = None, stop_price: float = None, account_id: str = None) -> dict:
+        if quantity <= 0:
+            raise ValueError("Quantity must be greater than 0")
+        if action not in ("buy", "sell"):
+            raise ValueError("Invalid action. Use 'buy' or 'sell'")
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Invalid order type. Use one of: {', '.join(ORDER_TYPES)}")
+        if order_type in ("limit", "stop_limit") and (limit_price is None or limit_price <= 0):
+            raise ValueError(f"A positive limit_price is required for {order_type} orders")
+        if order_type in ("stop", "stop_limit") and (stop_price is None or stop_price <= 0):
+            raise ValueError(f"A positive stop_price is required for {order_type} orders")
+
+        order = {
+            "id": uuid.uuid4().hex,
+            "account_id": account_id,
+            "stock": stock_symbol.upper(),
+            "action": action,
+            "order_type": order_type,
+            "quantity": quantity,
+            "limit_price": limit_price if order_type != "stop" else None,
+            "stop_price": stop_price if order_type != "limit" else None,
+            "status": "open",
+            "created_at": datetime.now().isoformat(),
+            "fill_price": None,
+            "filled_at": None,
+            "reason": None,
+        }
+        with self._lock:
+            book = self.books.setdefault(order["stock"], OrderBook())
+            if order_type == "limit":
+                book.push_limit(order, next(self._seq))
+            else:
+                book.push_stop(order, next(self._seq))
+            book.open_orders += 1
+            self.orders[order["id"]] = order
+        return order
+
+    def cancel(self, order_id: str, account_id: str = None) -> dict:
+        with self._lock:
+            order = self.orders.get(order_id)
+            if order is None or (account_id is not None and order["account_id"] != account_id):
+                raise KeyError(order_id)
+            if order["status"] not in OPEN_STATUSES:
+                raise ValueError(f"Order is already {order['status']}")
+            order["status"] = "cancelled"
+            self.books[order["stock"]].discard()
+            self._close(order)
+        return order
+
+    def symbols(self) -> list:
+        """
+        Symbols that still have resting orders and therefore need quotes
+        """
+        with self._lock:
+            return [symbol for symbol, book in self.books.items() if book.open_orders > 0]
+
+    def match(self, symbol: str, price: float) -> list:
+        """
+        Pop every order that executes at `price`. Triggered stop-limit orders
+        become resting limit orders and may execute in the same tick.
+        """
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None:
+                return []
+            executable = []
+            for order in book.triggered_stops(price):
+                if order["order_type"] == "stop":
+                    executable.append(order)
+                else:
+                    order["status"] = "triggered"
+                    book.push_limit(order, next(self._seq))
+            executable.extend(book.marketable_limits(price))
+            for order in executable:
+                order["status"] = "filling"
+            book.open_orders -= len(executable)
+            return executable
+
+    def mark_filled(self, order: dict, price: float):
+        with self._lock:
+            order["status"] = "filled"
+            order["fill_price"] = price
+            order["filled_at"] = datetime.now().isoformat()
+            self._close(order)
+
+    def mark_rejected(self, order: dict, reason: str):
+        with self._lock:
+            order["status"] = "rejected"
+            order["reason"] = reason
+            self._close(order)
+
+    def list_orders(self, status: str = None, account_id: str = None) -> list:
+        with self._lock:
+            self._evict_closed()
+            return [
+                dict(order) for order in self.orders.values()
+                if (status is None or order["status"] == status)
+                and (account_id is None or order["account_id"] == account_id)
+            ]
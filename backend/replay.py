@@ -0,0 +1,189 @@
+"""
+Historical portfolio replay and what-if simulation.
+
+Both scenario types are computed with whole-array arithmetic over a
+(date x symbol) close price matrix rather than stepping bar by bar:
+trade lists become a matrix of position changes that is cumulatively summed,
+and rebalancing rules become per-period growth factors that are cumulatively
+multiplied.
+"""
+
+from __future__ import annotations
+
+from backend.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Pandas period aliases: daily, weekly, monthly, quarterly, yearly
+REBALANCE_FREQUENCIES = ("D", "W", "M", "Q", "Y")
+
+
+def close_matrix(histories: dict) -> pd.DataFrame:
+    """
+    Align each symbol's Close column on a shared date index
+    """
+    closes = {symbol: df["Close"] for symbol, df in histories.items()}
+    return pd.DataFrame(closes).sort_index()
+
+
+def _scenario_prices(prices: pd.DataFrame, symbols: list) -> pd.DataFrame:
+    missing = [s for s in symbols if s not in prices.columns]
+    if missing:
+        raise ValueError(f"No price history for: {', '.join(missing)}")
+    # Carry prices over gaps, and start once every symbol has traded
+    sub = prices[symbols].ffill().dropna()
+    if sub.empty:
+        raise ValueError("Symbols have no overlapping price history")
+    return sub
+
+
+def _align_tz(ts: pd.Timestamp, tz) -> pd.Timestamp:
+    """
+    Express a trade date in the price index's timezone (or as naive UTC for a
+    naive index) so the two can be compared
+    """
+    if ts.tz is None:
+        return ts.tz_localize(tz) if tz is not None else ts
+    return ts.tz_convert(tz)
+
+
+def replay_trades(prices: pd.DataFrame, trades: list, initial_cash: float) -> dict:
+    """
+    Equity curve for a list of {"date", "stock_symbol", "quantity", "action"}
+    trades. Each trade executes at the close of the first bar on or after its date.
+    """
+    if any(t["quantity"] <= 0 for t in trades):
+        raise ValueError("Quantity must be greater than 0")
+    symbols = sorted({t["stock_symbol"].upper() for t in trades})
+    sub = _scenario_prices(prices, symbols)
+    index = sub.index
+    close = sub.to_numpy(dtype=float)
+
+    trade_dates = pd.DatetimeIndex([_align_tz(pd.Timestamp(t["date"]), index.tz) for t in trades])
+    # Trades before the first bar would otherwise silently execute at its close
+    if (trade_dates < index[0]).any():
+        raise ValueError(f"Trades dated before the start of the available history ({index[0].date()})")
+    rows = index.searchsorted(trade_dates, side="left")
+    if (rows >= len(index)).any():
+        raise ValueError("Trades dated after the end of the available history")
+    cols = np.array([symbols.index(t["stock_symbol"].upper()) for t in trades])
+    actions = np.array([t["action"] for t in trades])
+    if not np.isin(actions, ["buy", "sell"]).all():
+        raise ValueError("Invalid action. Use 'buy' or 'sell'")
+    signed = np.where(actions == "buy", 1.0, -1.0) * np.array([t["quantity"] for t in trades], dtype=float)
+
+    delta = np.zeros_like(close)
+    np.add.at(delta, (rows, cols), signed)
+    positions = np.cumsum(delta, axis=0)
+    cash = initial_cash - np.cumsum((delta * close).sum(axis=1))
+    equity = cash + (positions * close).sum(axis=1)
+
+    warnings = []
+    if (cash < -1e-9).any():
+        warnings.append(f"Cash goes negative on {index[np.argmax(cash < -1e-9)].date()}")
+    if (positions < 0).any():
+        warnings.append("Sells exceed holdings (short positions) at some point")
+
+    return {
+        "equity": pd.Series(equity, index=index),
+        "final_positions": dict(zip(symbols, positions[-1].tolist())),
+        "final_cash": float(cash[-1]),
+        "warnings": warnings,
+    }
+
+
+def replay_rebalance(prices: pd.DataFrame, weights: dict, frequency: str, initial_cash: float) -> dict:
+    """
+    Equity curve for holding fixed target weights, rebalanced at the first bar of
+    every period (fractional shares, no costs). Any weight left over stays in cash.
+    """
+    if frequency not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"Invalid frequency. Use one of: {', '.join(REBALANCE_FREQUENCIES)}")
+    if not weights:
+        raise ValueError("Rebalance rule needs at least one weight")
+    weights = {symbol.upper(): weight for symbol, weight in weights.items()}
+    symbols = sorted(weights)
+    w = np.array([weights[s] for s in symbols], dtype=float)
+    if (w < 0).any() or w.sum() > 1 + 1e-9:
+        raise ValueError("Weights must be non-negative and sum to at most 1")
+    cash_weight = 1.0 - w.sum()
+
+    sub = _scenario_prices(prices, symbols)
+    index = sub.index
+    close = sub.to_numpy(dtype=float)
+
+    periods = (index.tz_localize(None) if index.tz is not None else index).to_period(frequency)
+    is_rebalance = np.ones(len(index), dtype=bool)
+    is_rebalance[1:] = periods[1:] != periods[:-1]
+    rebalance_rows = np.flatnonzero(is_rebalance)
+    segment = np.cumsum(is_rebalance) - 1
+
+    # Value of 1 unit of equity, invested at the segment's first bar, on every bar
+    base = close[rebalance_rows]
+    growth = cash_weight + (w * close / base[segment]).sum(axis=1)
+    # Equity at each rebalance is what the previous segment grew to by that bar
+    period_factor = np.ones(len(rebalance_rows))
+    period_factor[1:] = cash_weight + (w * close[rebalance_rows[1:]] / base[:-1]).sum(axis=1)
+    equity_at_rebalance = initial_cash * np.cumprod(period_factor)
+    equity = equity_at_rebalance[segment] * growth
+
+    last_base = base[-1]
+    final_positions = equity_at_rebalance[-1] * w / last_base
+    return {
+        "equity": pd.Series(equity, index=index),
+        "final_positions": dict(zip(symbols, final_positions.tolist())),
+        "final_cash": float(equity_at_rebalance[-1] * cash_weight),
+        "rebalances": int(len(rebalance_rows)),
+        "warnings": [],
+    }
+
+
+def summarize(equity: pd.Series, initial_cash: float, period: str = "M") -> dict:
+    """
+    Headline statistics plus profit/loss per calendar period
+    """
+    values = equity.to_numpy(dtype=float)
+    running_peak = np.maximum.accumulate(values)
+    drawdown = values / running_peak - 1.0
+
+    index = equity.index.tz_localize(None) if equity.index.tz is not None else equity.index
+    period_end = equity.groupby(index.to_period(period)).last()
+    period_start = period_end.shift(1).fillna(initial_cash)
+    return {
+        "initial_cash": initial_cash,
+        "final_equity": float(values[-1]),
+        "profit_loss": float(values[-1] - initial_cash),
+        "total_return_pct": float((values[-1] / initial_cash - 1.0) * 100),
+        "max_drawdown_pct": float(drawdown.min() * 100),
+        "period_pnl": [
+            {"period": str(p), "profit_loss": float(end - start), "return_pct": float((end / start - 1.0) * 100)}
+            for p, start, end in zip(period_end.index, period_start.to_numpy(), period_end.to_numpy())
+        ],
+    }
+
+
+def run_scenario(prices: pd.DataFrame, scenario: dict, include_curve: bool = True) -> dict:
+    """
+    Run one scenario ({"trades": [...]} or {"rebalance": {...}}) against the
+    shared price matrix. Errors are reported per scenario.
+    """
+    name = scenario.get("name")
+    initial_cash = scenario.get("initial_cash", 100000.0)
+    try:
+        if scenario.get("trades"):
+            result = replay_trades(prices, scenario["trades"], initial_cash)
+        elif scenario.get("rebalance"):
+            rule = scenario["rebalance"]
+            result = replay_rebalance(prices, rule["weights"], rule.get("frequency", "M"), initial_cash)
+        else:
+            raise ValueError("Scenario needs either trades or a rebalance rule")
+    except (ValueError, KeyError) as e:
+        return {"name": name, "error": str(e)}
+
+    equity = result.pop("equity")
+    output = {"name": name, **result, **summarize(equity, initial_cash)}
+    if include_curve:
+        output["dates"] = equity.index.strftime('%Y-%m-%d %H:%M:%S').tolist()
+        output["equity"] = [round(float(v), 2) for v in equity.to_numpy()]
+    return output
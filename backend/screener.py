@@ -0,0 +1,167 @@
+"""
+Server-side stock screener backed by an in-memory columnar index of the latest
+technical indicator values for a universe of tickers.
+
+Indicators come from backend/indicators.py, the formulas the price predictor
+in ai.py uses, computed for every ticker at once on (date x ticker) panels.
+"""
+
+from __future__ import annotations
+
+import operator
+import os
+import threading
+import time
+from datetime import datetime
+
+from backend.indicators import technical_indicators
+from backend.lazy import lazy_import
+from backend.metrics import count_upstream, span
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+yf = lazy_import("yfinance")
+
+DEFAULT_UNIVERSE = [
+    "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "BRK-B", "JPM", "V",
+    "JNJ", "WMT", "PG", "MA", "UNH", "HD", "XOM", "CVX", "KO", "PEP",
+    "ABBV", "MRK", "LLY", "AVGO", "COST", "ORCL", "ADBE", "CRM", "NFLX", "AMD",
+    "INTC", "CSCO", "QCOM", "TXN", "IBM", "BAC", "WFC", "GS", "DIS", "NKE",
+]
+
+SCREENER_UNIVERSE = [t.strip().upper() for t in os.getenv("SCREENER_UNIVERSE", "").split(",") if t.strip()] or DEFAULT_UNIVERSE
+SCREENER_REFRESH_SECONDS = float(os.getenv("SCREENER_REFRESH_SECONDS", "900"))
+SCREENER_HISTORY_PERIOD = os.getenv("SCREENER_HISTORY_PERIOD", "1y")
+DOWNLOAD_CHUNK_SIZE = 200
+# Intermediate columns the predictor keeps as features but that are not screenable
+SCREENER_EXCLUDED = ("BB_Middle", "Volume_SMA", "High_20", "Low_20")
+
+# Applied to numpy arrays these are elementwise comparisons
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def download_panels(tickers: list, period: str = SCREENER_HISTORY_PERIOD) -> dict:
+    """
+    Download daily OHLCV for many tickers and return one (date x ticker) frame per field
+    """
+    panels = {"Close": [], "High": [], "Low": [], "Volume": []}
+    for start in range(0, len(tickers), DOWNLOAD_CHUNK_SIZE):
+        chunk = tickers[start:start + DOWNLOAD_CHUNK_SIZE]
+        count_upstream("download")
+        df = yf.download(chunk, period=period, interval="1d", group_by="column", auto_adjust=True, progress=False, threads=True)
+        if df.empty:
+            continue
+        for field in panels:
+            if isinstance(df.columns, pd.MultiIndex):
+                panel = df[field]
+            else:
+                panel = df[[field]].set_axis(chunk, axis=1)
+            panels[field].append(panel)
+    return {field: pd.concat(frames, axis=1) if frames else pd.DataFrame() for field, frames in panels.items()}
+
+
+def latest_indicators(close: pd.DataFrame, high: pd.DataFrame, low: pd.DataFrame, volume: pd.DataFrame) -> pd.DataFrame:
+    """
+    Latest value of every technical indicator, one row per ticker
+    """
+    indicators = {"Close": close, "Volume": volume, **technical_indicators(close, high, low, volume)}
+    for name in SCREENER_EXCLUDED:
+        del indicators[name]
+    return pd.DataFrame({name: panel.iloc[-1] for name, panel in indicators.items()})
+
+
+class ScreenerIndex:
+    """
+    Columnar snapshot of the latest indicators for a ticker universe. Each
+    indicator is a contiguous numpy array so a query is a handful of vectorized
+    comparisons and one argsort, regardless of universe size.
+    """
+
+    def __init__(self, universe: list = None, period: str = SCREENER_HISTORY_PERIOD):
+        self.universe = list(universe or SCREENER_UNIVERSE)
+        self.period = period
+        # (tickers, columns, updated_at), replaced as a whole on every refresh
+        self._snapshot = ((), {}, None)
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot[2] is not None
+
+    def load(self, indicators: pd.DataFrame):
+        """
+        Swap in a new snapshot; readers always see either the old or the new one
+        """
+        indicators = indicators.dropna(subset=["Close"])
+        columns = {name: indicators[name].to_numpy(dtype=float) for name in indicators.columns}
+        self._snapshot = (indicators.index.to_numpy(dtype=object), columns, datetime.now())
+
+    def refresh(self):
+        with self._refresh_lock:
+            with span("screener.download"):
+                panels = download_panels(self.universe, self.period)
+            if panels["Close"].empty:
+                raise ValueError("No screener data could be downloaded")
+            with span("screener.indicators"):
+                self.load(latest_indicators(panels["Close"], panels["High"], panels["Low"], panels["Volume"]))
+
+    def query(self, filters: list, sort_by: str = None, ascending: bool = True, limit: int = 50, fields: list = None) -> dict:
+        """
+        Apply filters of the form {"field", "op", "value"}, where value is a
+        number or the name of another indicator (e.g. Close > SMA_50)
+        """
+        start = time.perf_counter()
+        tickers, columns, updated_at = self._snapshot
+        mask = np.ones(len(tickers), dtype=bool)
+
+        with np.errstate(invalid="ignore"):
+            for f in filters:
+                if f["op"] not in OPERATORS:
+                    raise ValueError(f"Invalid operator '{f['op']}'. Use one of: {', '.join(OPERATORS)}")
+                lhs = self._column(columns, f["field"])
+                rhs = self._operand(columns, f["value"])
+                mask &= OPERATORS[f["op"]](lhs, rhs)
+
+        matches = np.flatnonzero(mask)
+        if sort_by:
+            keys = self._column(columns, sort_by)[matches]
+            # NaNs always sort last
+            order = np.argsort(keys if ascending else -keys, kind="stable")
+            matches = matches[order]
+
+        fields = fields or list(columns)
+        for field in fields:
+            self._column(columns, field)
+        top = matches[:limit]
+        results = [{"ticker": tickers[i], **{field: columns[field][i] for field in fields}} for i in top]
+
+        return {
+            "count": int(matches.size),
+            "universe_size": int(len(tickers)),
+            "as_of": updated_at.isoformat() if updated_at else None,
+            "query_ms": round((time.perf_counter() - start) * 1000, 3),
+            "results": results,
+        }
+
+    @classmethod
+    def _operand(cls, columns: dict, value):
+        """
+        A number (numeric strings included) or the column of the named indicator
+        """
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return cls._column(columns, value)
+
+    @staticmethod
+    def _column(columns: dict, name: str) -> np.ndarray:
+        if name not in columns:
+            raise ValueError(f"Unknown field '{name}'. Available fields: {', '.join(columns)}")
+        return columns[name]
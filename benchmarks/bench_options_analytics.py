@@ -0,0 +1,91 @@
+"""
+Benchmark the vectorized options analytics on a synthetic 5,000-contract surface.
+
+Run from the repository root:
+    python -m benchmarks.bench_options_analytics
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.options_analytics import DIVIDEND_YIELD, RISK_FREE_RATE, black_scholes_price, compute_analytics
+
+SPOT = 100.0
+N_EXPIRIES = 20
+N_STRIKES = 125  # x 2 option types x 20 expiries = 5,000 contracts
+
+# Contracts priced at (or within rounding of) intrinsic value, deep OTM or deep
+# ITM, carry no information about volatility, so the round-trip check only
+# covers contracts with meaningful time value
+MIN_TIME_VALUE = 0.01
+MAX_IV_ERROR = 1e-4
+
+
+def synthetic_surface(seed: int = 0) -> tuple:
+    """
+    Contracts priced from a known smile so the solver round-trip can be checked
+    """
+    rng = np.random.default_rng(seed)
+    t = np.repeat(np.linspace(7, 730, N_EXPIRIES) / 365.0, N_STRIKES * 2)
+    strike = np.tile(np.repeat(np.linspace(50, 150, N_STRIKES), 2), N_EXPIRIES)
+    is_call = np.tile([True, False], N_EXPIRIES * N_STRIKES)
+    log_m = np.log(strike / SPOT)
+    true_iv = 0.2 + 0.3 * log_m ** 2 - 0.1 * log_m + rng.normal(0, 0.005, t.size)
+    price = black_scholes_price(SPOT, strike, t, true_iv, is_call)
+
+    contracts = pd.DataFrame({
+        "contractSymbol": [f"SYN{i:05d}" for i in range(t.size)],
+        "option_type": np.where(is_call, "call", "put"),
+        "expiration": np.repeat([f"E{i:02d}" for i in range(N_EXPIRIES)], N_STRIKES * 2),
+        "strike": strike,
+        "market_price": price,
+        "t": t,
+    })
+    return contracts, true_iv
+
+
+def time_value(contracts: pd.DataFrame, spot: float, r: float = RISK_FREE_RATE, q: float = DIVIDEND_YIELD) -> np.ndarray:
+    """
+    Price above the discounted intrinsic value (the Black-Scholes lower bound)
+    """
+    t = contracts["t"].to_numpy()
+    disc_spot = spot * np.exp(-q * t)
+    disc_strike = contracts["strike"].to_numpy() * np.exp(-r * t)
+    intrinsic = np.where(contracts["option_type"] == "call", disc_spot - disc_strike, disc_strike - disc_spot)
+    return contracts["market_price"].to_numpy() - np.maximum(intrinsic, 0.0)
+
+
+def main(repeats: int = 20) -> int:
+    contracts, true_iv = synthetic_surface()
+    compute_analytics(contracts, SPOT)  # warm up
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        analyzed = compute_analytics(contracts, SPOT)
+        timings.append(time.perf_counter() - start)
+
+    solved = analyzed["implied_volatility"].to_numpy()
+    checked = time_value(contracts, SPOT) > MIN_TIME_VALUE
+    unsolved = checked & ~np.isfinite(solved)
+    compared = checked & np.isfinite(solved)
+    max_error = np.max(np.abs(solved[compared] - true_iv[compared])) if compared.any() else float("nan")
+
+    print(f"Contracts:        {len(contracts)}")
+    print(f"Solved:           {np.isfinite(solved).sum()} ({np.isfinite(solved).mean() * 100:.1f}%)")
+    print(f"Checked:          {checked.sum()} (time value > {MIN_TIME_VALUE})")
+    print(f"Max IV error:     {max_error:.2e}")
+    print(f"Median time:      {np.median(timings) * 1000:.2f} ms")
+    print(f"Best time:        {np.min(timings) * 1000:.2f} ms")
+
+    if unsolved.any() or not max_error <= MAX_IV_ERROR:
+        print(f"FAIL: {unsolved.sum()} checked contracts unsolved, max IV error above {MAX_IV_ERROR:.0e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
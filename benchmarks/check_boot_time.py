@@ -0,0 +1,81 @@
+"""
+Enforce the backend boot-time budget.
+
+Imports backend.main in fresh interpreters and fails when the median import
+time exceeds the target, or when a heavy dependency is imported eagerly
+instead of through backend.lazy.
+
+Run from the repository root:
+    python -m benchmarks.check_boot_time
+    python -m benchmarks.check_boot_time --profile   # slowest imports (-X importtime)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BOOT_TIME_TARGET = float(os.getenv("BOOT_TIME_TARGET", "1.0"))
+DEFERRED_MODULES = ["pandas", "numpy", "yfinance", "torch"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import backend.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "eager": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_boot() -> dict:
+    output = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def profile_imports(top: int = 15):
+    """
+    Print the slowest cumulative imports reported by `python -X importtime`
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"], cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), name))
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1e6:8.3f} s  {name}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check backend import time against the boot budget")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=BOOT_TIME_TARGET, help="seconds (default: $BOOT_TIME_TARGET or 1.0)")
+    parser.add_argument("--profile", action="store_true", help="print the slowest imports")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profile_imports()
+        print()
+
+    runs = [measure_boot() for _ in range(args.runs)]
+    median = statistics.median(run["seconds"] for run in runs)
+    eager = sorted({module for run in runs for module in run["eager"]})
+    print(f"backend.main import: median {median:.3f} s over {args.runs} runs (target {args.target:.3f} s)")
+
+    failed = False
+    if eager:
+        print(f"FAIL: imported at boot, should be deferred: {', '.join(eager)}")
+        failed = True
+    if median > args.target:
+        print("FAIL: boot time over target")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
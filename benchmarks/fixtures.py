@@ -0,0 +1,138 @@
+"""
+Deterministic synthetic market data that stands in for yfinance, so benchmarks
+run offline and produce comparable numbers from run to run.
+"""
+
+import zlib
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from backend.options_analytics import black_scholes_price
+
+OptionChain = namedtuple("OptionChain", ["calls", "puts", "underlying"])
+
+_FREQUENCIES = {"1m": "min", "1h": "h", "4h": "4h", "1d": "B", "1wk": "W-FRI", "1mo": "MS", "3mo": "QS"}
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32("|".join(str(p) for p in parts).encode())
+
+
+def synthetic_ohlcv(ticker: str = "SYN", rows: int = 500, interval: str = "1d", start_price: float = 100.0) -> pd.DataFrame:
+    """
+    Geometric random walk OHLCV bars with yfinance's column layout
+    """
+    rng = np.random.default_rng(_seed(ticker, rows, interval))
+    index = pd.date_range(end=pd.Timestamp("2024-12-31"), periods=rows, freq=_FREQUENCIES.get(interval, "B"), name="Date")
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0003, 0.015, rows)))
+    open_ = close * np.exp(rng.normal(0, 0.005, rows))
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 50_000_000, rows).astype(float),
+    }, index=index)
+
+
+def synthetic_option_dates(count: int = 8) -> tuple:
+    first = date(2025, 1, 3)
+    return tuple((first + timedelta(weeks=i)).isoformat() for i in range(count))
+
+
+def synthetic_option_chain(ticker: str, expiration: str, spot: float = 100.0, strikes: int = 100) -> OptionChain:
+    """
+    Calls and puts priced off a smile, with yfinance's option chain columns
+    """
+    rng = np.random.default_rng(_seed(ticker, expiration, strikes))
+    strike = np.linspace(spot * 0.5, spot * 1.5, strikes)
+    t = max((date.fromisoformat(expiration) - date(2024, 12, 31)).days, 1) / 365.0
+    log_m = np.log(strike / spot)
+    iv = 0.2 + 0.3 * log_m ** 2 - 0.1 * log_m
+
+    frames = []
+    for kind, is_call in (("C", True), ("P", False)):
+        mid = black_scholes_price(spot, strike, t, iv, is_call)
+        half_spread = np.maximum(mid * 0.02, 0.01)
+        frames.append(pd.DataFrame({
+            "contractSymbol": [f"{ticker}{expiration.replace('-', '')[2:]}{kind}{int(k * 1000):08d}" for k in strike],
+            "lastTradeDate": pd.Timestamp("2024-12-31 15:59", tz="UTC"),
+            "strike": strike,
+            "lastPrice": mid,
+            "bid": np.maximum(mid - half_spread, 0.0),
+            "ask": mid + half_spread,
+            "change": rng.normal(0, 0.1, strikes),
+            "percentChange": rng.normal(0, 1, strikes),
+            "volume": rng.integers(0, 5000, strikes).astype(float),
+            "openInterest": rng.integers(0, 20000, strikes),
+            "impliedVolatility": iv,
+            "inTheMoney": strike < spot if is_call else strike > spot,
+            "contractSize": "REGULAR",
+            "currency": "USD",
+        }))
+    return OptionChain(calls=frames[0], puts=frames[1], underlying={"regularMarketPrice": spot})
+
+
+class FakeTicker:
+    """
+    The subset of yf.Ticker used by the app, backed by synthetic data
+    """
+
+    def __init__(self, ticker: str, rows: int = 500, strikes: int = 100):
+        self.ticker = ticker.upper()
+        self.rows = rows
+        self.strikes = strikes
+
+    @property
+    def options(self) -> tuple:
+        return synthetic_option_dates()
+
+    def history(self, period: str = "1mo", interval: str = "1d", **kwargs) -> pd.DataFrame:
+        bars = cached_ohlcv(self.ticker, self.rows, interval)
+        return bars.iloc[-1:] if period == "1d" else bars
+
+    def option_chain(self, date: str = None) -> OptionChain:
+        spot = float(cached_ohlcv(self.ticker, self.rows)["Close"].iloc[-1])
+        return synthetic_option_chain(self.ticker, date or self.options[0], spot, self.strikes)
+
+
+# Each series is generated once so timings measure the code under test, not the fixture
+_cached_ohlcv = lru_cache(maxsize=256)(synthetic_ohlcv)
+
+
+def cached_ohlcv(ticker: str, rows: int, interval: str = "1d") -> pd.DataFrame:
+    return _cached_ohlcv(ticker, rows, interval).copy()
+
+
+def fake_download(rows: int):
+    def bars(ticker, interval):
+        return cached_ohlcv(ticker, rows, interval)
+
+    def download(tickers, period: str = "1mo", interval: str = "1d", **kwargs) -> pd.DataFrame:
+        if isinstance(tickers, str):
+            return bars(tickers.upper(), interval)
+        # Multiple tickers come back as (field, ticker) columns, like group_by="column"
+        frames = {t: bars(t, interval) for t in tickers}
+        return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+    return download
+
+
+@contextmanager
+def offline_market_data(rows: int = 500, strikes: int = 100):
+    """
+    Replace yf.download and yf.Ticker with synthetic data for the duration of the block
+    """
+    original_download, original_ticker = yf.download, yf.Ticker
+    yf.download = fake_download(rows)
+    yf.Ticker = lambda ticker, *args, **kwargs: FakeTicker(ticker, rows, strikes)
+    try:
+        yield
+    finally:
+        yf.download, yf.Ticker = original_download, original_ticker
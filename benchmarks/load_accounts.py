@@ -0,0 +1,128 @@
+"""
+Load test for the per-account portfolio endpoints.
+
+Sends buy/sell round trips and portfolio reads through the FastAPI app itself
+(routing, validation, middleware and the trade handler, including its quote
+fetch in the threadpool), with yfinance replaced by the offline fixtures.
+Requests are issued in-process over ASGI, so no server or network is needed.
+
+For each account count and concurrency level it prints request throughput and
+latency percentiles for a single worker process.
+
+This does not show throughput scaling with workers, and the app cannot be
+scaled that way yet: account state lives in the worker's memory, so several
+uvicorn workers would each hold a different balance for the same account.
+Within one worker the shard locks never block request handlers either, since
+handlers only take them in short synchronous blocks on the event loop thread;
+they only guard against the order matching thread. Multi-worker scaling needs
+account state in a shared store first.
+
+Run from the repository root:
+    python -m benchmarks.load_accounts --accounts 1 16 256 --concurrency 1 8 32
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from backend.main import accounts, app
+from benchmarks.fixtures import offline_market_data
+
+
+async def asgi_request(method: str, path: str, body: dict = None) -> tuple:
+    """
+    Send one HTTP request straight to the ASGI app; returns (status, json body)
+    """
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"loadtest"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("loadtest", 80),
+    }
+    received = False
+    status = None
+    chunks = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, json.loads(b"".join(chunks) or b"null")
+
+
+async def client(account_ids: list, requests: int, latencies: list):
+    """
+    Alternate buy and sell of one share across the given accounts, reading the
+    portfolio back after every sell
+    """
+    for i in range(requests):
+        account_id = account_ids[i % len(account_ids)]
+        if (i // len(account_ids)) % 3 == 2:
+            method, path, body = "GET", f"/api/accounts/{account_id}/portfolio", None
+        else:
+            action = "buy" if (i // len(account_ids)) % 3 == 0 else "sell"
+            method, path = "POST", f"/api/accounts/{account_id}/trade"
+            body = {"stock_symbol": "SYN", "quantity": 1, "action": action}
+        start = time.perf_counter()
+        status, response = await asgi_request(method, path, body)
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            raise RuntimeError(f"{method} {path} returned {status}: {response}")
+
+
+async def run_load(account_count: int, concurrency: int, requests_per_client: int) -> dict:
+    account_ids = [f"load-{i}" for i in range(account_count)]
+    for account_id in account_ids:
+        accounts.reset(account_id)
+    # Client i trades accounts i, i + concurrency, ...; with fewer accounts than
+    # clients, several clients interleave trades on the same account
+    assignments = [account_ids[i::concurrency] or [account_ids[i % account_count]] for i in range(concurrency)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(assigned, requests_per_client, latencies) for assigned in assignments))
+    elapsed = time.perf_counter() - start
+    return {"requests": len(latencies), "seconds": elapsed, "latencies": np.array(latencies)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-account portfolio endpoint load test")
+    parser.add_argument("--accounts", type=int, nargs="+", default=[1, 16, 256])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=600, help="requests per concurrent client")
+    args = parser.parse_args(argv)
+
+    print(f"{'accounts':>8} {'clients':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    with offline_market_data():
+        for account_count in args.accounts:
+            for concurrency in args.concurrency:
+                result = asyncio.run(run_load(account_count, concurrency, args.requests))
+                p50, p99 = np.percentile(result["latencies"], [50, 99]) * 1000
+                throughput = result["requests"] / result["seconds"]
+                print(f"{account_count:>8} {concurrency:>8} {throughput:>10,.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Offline benchmark suite for the API handlers and the PyTorch predictor.
+
+All market data comes from benchmarks/fixtures.py, so results only depend on the
+machine and the code. Timings are compared against a stored baseline and any
+case slower than the tolerance is reported as a regression (non-zero exit).
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks                  # compare with baseline
+    python -m benchmarks.run_benchmarks --save-baseline  # record a new baseline
+    python -m benchmarks.run_benchmarks -k stock_data    # only matching cases
+
+Baselines are machine specific, so record one on the machine (or CI runner
+type) that will be used for comparisons. The committed baseline.json was
+recorded on a single-core Linux x86_64 host; CI runs on shared ubuntu runners,
+so it only flags cases more than twice as slow (--tolerance 1.0). Re-record
+the baseline with --save-baseline when a change is meant to move the numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.fixtures import offline_market_data, synthetic_ohlcv
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+DATA_SIZES = [250, 2500, 25000]
+CHAIN_SIZES = [50, 500, 2000]
+INDICATOR_SIZES = [500, 5000, 50000]
+SEQUENCE_SIZES = [500, 5000, 20000]
+TRAINING_SIZES = [300, 1000]
+TRAINING_EPOCHS = 3
+ORDER_BOOK_SIZES = [1000, 10000, 50000]
+REPLAY_SCENARIO_COUNTS = [10, 100, 500]
+
+BENCHMARKS = []
+
+
+def benchmark(name: str, sizes: list, repeat: int = 5, requires: str = None):
+    """
+    Register `setup(size) -> callable`; only the returned callable is timed
+    """
+    def decorator(setup):
+        BENCHMARKS.append({"name": name, "sizes": sizes, "repeat": repeat, "requires": requires, "setup": setup})
+        return setup
+    return decorator
+
+
+def _predictor(rows: int):
+    from ai import StockPredictor
+    predictor = StockPredictor("SYN", device="cpu")
+    predictor.data = synthetic_ohlcv("SYN", rows)
+    return predictor
+
+
+def _training_split(predictor):
+    X, y, _ = predictor.prepare_features()
+    split_idx = int(len(X) * 0.8)
+    X_train, X_test = predictor.normalize_data(X[:split_idx], X[split_idx:])
+    return X_train, y[:split_idx], X_test, y[split_idx:]
+
+
+@benchmark("stock_data", DATA_SIZES)
+def bench_stock_data(rows):
+    from backend.main import StockDataRequest, get_stock_data, history_cache
+    request = StockDataRequest(ticker="SYN", period="max", interval="1d", view_type="both")
+
+    def run():
+        # Time the fetch and frame clean-up too, not just a cache hit
+        history_cache.clear()
+        with offline_market_data(rows=rows):
+            asyncio.run(get_stock_data(request))
+    return run
+
+
+@benchmark("option_chain_serialization", CHAIN_SIZES)
+def bench_option_chain(strikes):
+    from backend.main import get_option_chain, option_chain_cache
+
+    # The first (warm-up) call fills the cache, so the timed calls measure serialization only
+    option_chain_cache.clear()
+
+    def run():
+        with offline_market_data(strikes=strikes):
+            asyncio.run(get_option_chain("SYN", "2025-01-03"))
+    return run
+
+
+@benchmark("options_analytics_surface", [5000])
+def bench_options_analytics(contracts):
+    from backend.options_analytics import compute_analytics
+    from benchmarks.bench_options_analytics import SPOT, synthetic_surface
+    surface, _ = synthetic_surface()
+    return lambda: compute_analytics(surface, SPOT)
+
+
+@benchmark("calculate_technical_indicators", INDICATOR_SIZES, requires="torch")
+def bench_indicators(rows):
+    predictor = _predictor(rows)
+    return predictor.calculate_technical_indicators
+
+
+@benchmark("create_sequences", SEQUENCE_SIZES, requires="torch")
+def bench_create_sequences(rows):
+    predictor = _predictor(100)
+    rng = np.random.default_rng(rows)
+    X, y = rng.normal(size=(rows, 20)), rng.normal(size=rows)
+    return lambda: predictor.create_sequences(X, y, seq_length=10)
+
+
+@benchmark("train_feedforward_model", TRAINING_SIZES, repeat=3, requires="torch")
+def bench_train_feedforward(rows):
+    import torch
+    predictor = _predictor(rows)
+    split = _training_split(predictor)
+
+    def run():
+        torch.manual_seed(0)
+        predictor.train_feedforward_model(*split, epochs=TRAINING_EPOCHS)
+    return run
+
+
+@benchmark("train_lstm_model", TRAINING_SIZES, repeat=3, requires="torch")
+def bench_train_lstm(rows):
+    import torch
+    predictor = _predictor(rows)
+    split = _training_split(predictor)
+
+    def run():
+        torch.manual_seed(0)
+        predictor.train_lstm_model(*split, epochs=TRAINING_EPOCHS)
+    return run
+
+
+@benchmark("predict_next_price", TRAINING_SIZES, requires="torch")
+def bench_predict(rows):
+    import torch
+    torch.manual_seed(0)
+    predictor = _predictor(rows)
+    split = _training_split(predictor)
+    predictor.train_feedforward_model(*split, epochs=1)
+    predictor.train_lstm_model(*split, epochs=1)
+    return predictor.predict_next_price
+
+
+@benchmark("order_matching", ORDER_BOOK_SIZES)
+def bench_order_matching(resting):
+    from backend.orders import OrderEngine
+    rng = np.random.default_rng(resting)
+    actions = rng.choice(["buy", "sell"], resting)
+    order_types = rng.choice(["limit", "stop", "stop_limit"], resting)
+    # Resting orders well away from the quote; only the tails are reached by the ticks
+    offsets = rng.uniform(0.02, 0.30, resting)
+    ticks = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.002, 1000)))
+
+    def run():
+        engine = OrderEngine()
+        for action, order_type, offset in zip(actions, order_types, offsets):
+            away = 1 - offset if (action == "buy") == (order_type == "limit") else 1 + offset
+            engine.submit("SYN", 1, action, order_type, limit_price=100.0 * away, stop_price=100.0 * away)
+        for price in ticks:
+            engine.match("SYN", float(price))
+    return run
+
+
+@benchmark("replay_scenarios", REPLAY_SCENARIO_COUNTS)
+def bench_replay(count):
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.replay import close_matrix, run_scenario
+    symbols = [f"SYN{i}" for i in range(20)]
+    prices = close_matrix({s: synthetic_ohlcv(s, 1260) for s in symbols})
+    rng = np.random.default_rng(count)
+    dates = prices.index.strftime("%Y-%m-%d")
+    scenarios = []
+    for i in range(count):
+        picks = rng.choice(symbols, 5, replace=False)
+        if i % 2:
+            scenarios.append({"rebalance": {"weights": {s: 0.19 for s in picks}, "frequency": "M"}})
+        else:
+            scenarios.append({"trades": [
+                {"date": dates[d], "stock_symbol": s, "quantity": 10, "action": "buy"}
+                for d, s in zip(np.sort(rng.choice(len(dates), 50)), rng.choice(picks, 50))
+            ]})
+
+    def run():
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(lambda scenario: run_scenario(prices, scenario), scenarios))
+    return run
+
+
+def _available(module: str) -> bool:
+    if module is None:
+        return True
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def run_case(case: dict, size: int) -> dict:
+    fn = case["setup"](size)
+    fn()  # warm up caches, lazy imports and allocator
+    timings = []
+    for _ in range(case["repeat"]):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings), "repeat": case["repeat"]}
+
+
+def run_suite(pattern: str = None) -> dict:
+    results = {}
+    for case in BENCHMARKS:
+        if pattern and pattern not in case["name"]:
+            continue
+        if not _available(case["requires"]):
+            print(f"skip  {case['name']} ({case['requires']} not installed)")
+            continue
+        for size in case["sizes"]:
+            key = f"{case['name']}[{size}]"
+            # Training loops print progress; keep the report readable
+            stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+            try:
+                results[key] = run_case(case, size)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+            print(f"{key:<45} min {results[key]['min'] * 1000:10.2f} ms   median {results[key]['median'] * 1000:10.2f} ms")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Cases whose best time is slower than baseline by more than `tolerance`
+    """
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        ratio = result["min"] / previous["min"]
+        if ratio > 1 + tolerance:
+            regressions.append((key, previous["min"], result["min"], ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this string")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.pattern)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f).get("results", {})
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(), "results": baseline}, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of baseline")
+        return 0
+
+    print(f"\nRegressions beyond {args.tolerance:.0%} of baseline:")
+    for key, before, after, ratio in regressions:
+        print(f"  {key:<45} {before * 1000:10.2f} ms -> {after * 1000:10.2f} ms  ({ratio:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,14 +39,36 @@ export const stockAPI = {
   },
 };
 
+// Each browser gets its own paper-trading account, identified by a random id
+// kept in localStorage, so users of a shared deployment never see each other's portfolio
+const ACCOUNT_ID_KEY = 'accountId';
+
+const generateAccountId = (): string => {
+  if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  return Array.from({ length: 32 }, () => Math.floor(Math.random() * 16).toString(16)).join('');
+};
+
+export const getAccountId = (): string => {
+  let accountId = localStorage.getItem(ACCOUNT_ID_KEY);
+  if (!accountId) {
+    accountId = generateAccountId();
+    localStorage.setItem(ACCOUNT_ID_KEY, accountId);
+  }
+  return accountId;
+};
+
+const accountPath = (path: string): string => `/accounts/${encodeURIComponent(getAccountId())}${path}`;
+
 export const portfolioAPI = {
   getPortfolio: async (): Promise<Portfolio> => {
-    const response = await api.get('/portfolio');
+    const response = await api.get(accountPath('/portfolio'));
     return response.data;
   },
 
   manageFunds: async (amount: number, action: 'add' | 'withdraw'): Promise<Portfolio | null> => {
-    const response = await api.post('/portfolio/funds', { amount, action });
+    const response = await api.post(accountPath('/funds'), { amount, action });
     return response.data.portfolio || null;
   },
 
@@ -55,7 +77,7 @@ export const portfolioAPI = {
     quantity: number,
     action: 'buy' | 'sell'
   ): Promise<Portfolio> => {
-    const response = await api.post('/portfolio/trade', {
+    const response = await api.post(accountPath('/trade'), {
       stock_symbol: stockSymbol,
       quantity,
       action,
@@ -64,7 +86,7 @@ export const portfolioAPI = {
   },
 
   resetPortfolio: async (): Promise<Portfolio> => {
-    const response = await api.post('/portfolio/reset');
+    const response = await api.post(accountPath('/reset'));
     return response.data.portfolio;
   },
 };